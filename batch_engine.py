@@ -0,0 +1,158 @@
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from ley_line_generator import (
+    generate_nodes_and_ley_lines,
+    validate_platonic_solid_nodes,
+    validate_ley_line_connections
+)
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ('thread', 'process')
+
+def normalize_configuration(config) -> dict:
+    """
+    Turn a batch configuration into a configuration dictionary.
+
+    Args:
+        config: Either a dict with 'solid_type', 'radius', 'max_distance' and optionally
+                'auto_adjust'/'frequency', or a (solid_type, radius, max_distance, auto_adjust) tuple.
+
+    Returns:
+        dict: Configuration with all keys present.
+    """
+    if not isinstance(config, dict):
+        solid_type, radius, max_distance, auto_adjust = config
+        config = {"solid_type": solid_type, "radius": radius, "max_distance": max_distance,
+                  "auto_adjust": auto_adjust}
+    return {
+        "solid_type": config["solid_type"],
+        "radius": config["radius"],
+        "max_distance": config["max_distance"],
+        "auto_adjust": config.get("auto_adjust", False),
+        "frequency": config.get("frequency", 1)
+    }
+
+def parameter_grid(solid_types: list, radii: list, max_distances: list, auto_adjust: list = (False,)) -> list:
+    """
+    Build the cartesian product of parameter values for a batch sweep.
+
+    Args:
+        solid_types (list): Solid types to include.
+        radii (list): Sphere radii in kilometers.
+        max_distances (list): Maximum ley line distances in kilometers.
+        auto_adjust (list): Auto-adjust flags.
+
+    Returns:
+        list: Configuration dictionaries in product order.
+    """
+    return [normalize_configuration(combo)
+            for combo in itertools.product(solid_types, radii, max_distances, auto_adjust)]
+
+def evaluate_configuration(config) -> dict:
+    """
+    Generate, validate and summarise one network configuration.
+
+    Args:
+        config: Configuration dictionary or tuple (see normalize_configuration).
+
+    Returns:
+        dict: Batch result with 'configuration', 'data', 'validation' and 'statistics'.
+
+    Raises:
+        ValueError: If the configuration is invalid.
+    """
+    config = normalize_configuration(config)
+    solid = config["solid_type"]
+    config_data = generate_nodes_and_ley_lines(
+        solid_type=solid,
+        radius=config["radius"],
+        max_distance=config["max_distance"],
+        auto_adjust=config["auto_adjust"],
+        frequency=config["frequency"]
+    )
+
+    nodes_valid, nodes_message = validate_platonic_solid_nodes(config_data["nodes"], solid, config["frequency"])
+    connections_valid, connections_message = validate_ley_line_connections(
+        config_data["nodes"],
+        config_data["ley_lines"],
+        config["max_distance"],
+        config["radius"]
+    )
+    # The generator already derived suggestions at this radius (mesh edge based for geodesic solids)
+    parameter_suggestions = config_data["metadata"]["suggested_parameters"]
+
+    configuration = {
+        "solid_type": solid,
+        "radius": config["radius"],
+        "max_distance": config["max_distance"],
+        "auto_adjust_enabled": config["auto_adjust"]
+    }
+    if solid in ("geodesic", "goldberg"):
+        configuration["frequency"] = config["frequency"]
+
+    return {
+        "configuration": configuration,
+        "data": config_data,
+        "validation": {
+            "nodes_valid": nodes_valid,
+            "nodes_message": nodes_message,
+            "connections_valid": connections_valid,
+            "connections_message": connections_message,
+            "parameter_suggestions": parameter_suggestions
+        },
+        "statistics": {
+            "total_nodes": len(config_data["nodes"]),
+            "total_ley_lines": len(config_data["ley_lines"]),
+            "primary_ley_lines": sum(1 for line in config_data["ley_lines"] if line["category"] == "primary")
+        }
+    }
+
+def run_batch(configurations: list, executor: str = 'process', max_workers: int = None,
+              progress_callback=None) -> list:
+    """
+    Evaluate many configurations concurrently.
+
+    Results come back in submission order. Invalid configurations do not abort the
+    batch; their entry holds the configuration and an 'error' message instead.
+
+    Args:
+        configurations (list): Configuration dicts or (solid_type, radius, max_distance, auto_adjust) tuples.
+        executor (str): 'process' to use one process per core (best for large sweeps) or
+                        'thread' to stay in-process (e.g. inside the Streamlit script).
+        max_workers (int): Pool size. Defaults to os.cpu_count().
+        progress_callback (callable): Called as progress_callback(completed, total, result)
+                                      from the calling thread each time a configuration finishes.
+
+    Returns:
+        list: One result per configuration, in submission order.
+
+    Raises:
+        ValueError: If the executor is unknown.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unsupported executor '{executor}'. Supported executors are {EXECUTORS}.")
+    configurations = [normalize_configuration(config) for config in configurations]
+    total = len(configurations)
+    results = [None] * total
+    if total == 0:
+        return results
+
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    workers = min(total, max_workers or os.cpu_count() or 1)
+    with pool_class(max_workers=workers) as pool:
+        futures = {pool.submit(evaluate_configuration, config): index
+                   for index, config in enumerate(configurations)}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except ValueError as e:
+                logger.warning("Skipping invalid configuration %s: %s", configurations[index], e)
+                results[index] = {"configuration": configurations[index], "error": str(e)}
+            if progress_callback is not None:
+                progress_callback(completed, total, results[index])
+    return results
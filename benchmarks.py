@@ -0,0 +1,367 @@
+import argparse
+import copy
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from distance_engine import distance_cache
+from ley_line_generator import (
+    CONNECTION_METHODS,
+    generate_nodes_and_ley_lines,
+    generate_platonic_solid,
+    connect_nodes,
+    suggest_distance_parameters,
+    validate_ley_line_connections,
+    save_to_file
+)
+from platonic import PLATONIC_SOLIDS
+
+logger = logging.getLogger(__name__)
+
+# Node counts of the synthetic ladder, geodesic frequencies of the generation ladder
+# (162, 2562 and 10242 nodes) and the default regression tolerances (time and peak memory)
+DEFAULT_SIZES = (100, 1000, 5000)
+DEFAULT_FREQUENCIES = (4, 16, 32)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.25
+BENCHMARK_FORMAT_VERSION = 1
+
+# Reports go to a git-ignored directory unless --output says otherwise
+DEFAULT_OUTPUT = os.path.join(".benchmarks", "benchmark_results.json")
+
+# UI presets next to this module, independent of the working directory
+PRESETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "presets.json")
+
+# Benchmarks whose work is proportional to the number of node pairs
+PAIRWISE_BENCHMARKS = ('connect_nodes', 'suggest_distance_parameters')
+
+def synthetic_nodes(count: int, seed: int = 0) -> list:
+    """
+    Nodes spread uniformly at random over the sphere, in the legacy node format.
+
+    Args:
+        count (int): Number of nodes.
+        seed (int): Random seed, so every run benchmarks the same layout.
+
+    Returns:
+        list: Node dictionaries.
+    """
+    rng = np.random.default_rng(seed)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, count)))
+    longitudes = rng.uniform(-180.0, 180.0, count)
+    return [{
+        "id": f"node_{i:03}",
+        "coordinates": {"latitude": lat, "longitude": lon},
+        "category": "major_node",
+        "associated_ley_lines": [],
+        "nearby_nodes": []
+    } for i, (lat, lon) in enumerate(zip(latitudes.tolist(), longitudes.tolist()))]
+
+def load_benchmark_presets(path: str = PRESETS_PATH) -> dict:
+    """Read the UI presets without creating the file when it is missing."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        presets = json.load(f)
+    return {name: preset for name, preset in presets.items() if preset.get("solid_type") in PLATONIC_SOLIDS}
+
+def benchmark_inputs(sizes, max_distance: float, radius: float = 6371, seed: int = 0) -> list:
+    """
+    Build the benchmark inputs: the synthetic node ladder followed by the presets.
+
+    Returns:
+        list: Dictionaries with 'label', 'radius', 'max_distance', 'nodes' and optionally 'solid_type'.
+    """
+    inputs = [{
+        "label": f"synthetic-{count}",
+        "radius": radius,
+        "max_distance": max_distance,
+        "nodes": synthetic_nodes(count, seed)
+    } for count in sizes]
+    for name, preset in load_benchmark_presets().items():
+        inputs.append({
+            "label": f"preset-{name}",
+            "solid_type": preset["solid_type"],
+            "radius": preset["radius"],
+            "max_distance": preset["max_distance"],
+            "nodes": generate_platonic_solid(preset["solid_type"], preset["radius"])
+        })
+    return inputs
+
+def measure(function, setup=None, repeat: int = 3, memory: bool = True) -> dict:
+    """
+    Time a callable and record its peak traced memory.
+
+    setup() runs before every call, outside the timed region, and its result is passed
+    to function. Memory is measured in one extra call so tracing does not skew the times.
+
+    Returns:
+        dict: 'seconds' (median), 'best_seconds', 'repeat' and 'peak_memory_bytes'.
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        argument = setup() if setup else None
+        tracemalloc.start()
+        try:
+            function(argument)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "seconds": statistics.median(times),
+        "best_seconds": min(times),
+        "repeat": repeat,
+        "peak_memory_bytes": peak
+    }
+
+def run_benchmarks(sizes=DEFAULT_SIZES, max_distance: float = 1000, repeat: int = 3, method: str = 'auto',
+                   render: bool = True, memory: bool = True, progress=None,
+                   frequencies=DEFAULT_FREQUENCIES) -> dict:
+    """
+    Run every benchmark over every input.
+
+    Distance caches are cleared before each timed call, so each measurement includes the
+    full pairwise work. Geodesic meshes of increasing frequency additionally time
+    end-to-end generation and saving, so scaling regressions in generation show up.
+
+    Args:
+        sizes: Node counts of the synthetic ladder.
+        max_distance (float): Connection distance for synthetic inputs in kilometers.
+        repeat (int): Timed calls per benchmark.
+        method (str): Pair evaluation strategy passed to connect_nodes.
+        render (bool): Include create_globe_visualization (needs plotly).
+        memory (bool): Record peak traced memory.
+        progress (callable): Called with a message before each benchmark.
+        frequencies: Frequencies of the geodesic generation ladder.
+
+    Returns:
+        dict: Report with 'format_version', 'environment', 'settings' and 'results'.
+    """
+    create_globe_visualization = None
+    if render:
+        try:
+            from utils import create_globe_visualization
+        except ImportError:
+            logger.warning("plotly is not installed; skipping rendering benchmarks.")
+
+    results = []
+    output_dir = tempfile.mkdtemp(prefix="leyline_bench_")
+
+    def record(name, function, setup, label, count, num_ley_lines):
+        if progress:
+            progress(f"{name} [{label}]")
+        result = measure(function, setup, repeat, memory)
+        pairs = count * (count - 1) // 2
+        result.update({
+            "benchmark": name,
+            "input": label,
+            "nodes": count,
+            "ley_lines": num_ley_lines,
+            "pairs": pairs
+        })
+        if name in PAIRWISE_BENCHMARKS:
+            result["pairs_per_second"] = pairs / result["seconds"] if result["seconds"] > 0 else None
+        results.append(result)
+
+    for item in benchmark_inputs(sizes, max_distance):
+        nodes = item["nodes"]
+        radius = item["radius"]
+        limit = item["max_distance"]
+        count = len(nodes)
+
+        def fresh_nodes():
+            distance_cache.clear()
+            return copy.deepcopy(nodes)
+
+        connected = copy.deepcopy(nodes)
+        distance_cache.clear()
+        ley_lines, metadata = connect_nodes(connected, radius, limit, method=method)
+        data = {"nodes": connected, "ley_lines": ley_lines, "metadata": metadata}
+        output_file = os.path.join(output_dir, f"{item['label']}.json")
+
+        cases = []
+        if "solid_type" in item:
+            cases.append(("generate_platonic_solid", lambda _: generate_platonic_solid(item["solid_type"], radius), None))
+        cases.extend([
+            ("connect_nodes", lambda fresh: connect_nodes(fresh, radius, limit, method=method), fresh_nodes),
+            ("suggest_distance_parameters", lambda fresh: suggest_distance_parameters(fresh), fresh_nodes),
+            ("validate_ley_line_connections",
+             lambda _: validate_ley_line_connections(connected, ley_lines, limit, radius), distance_cache.clear),
+        ])
+        if create_globe_visualization is not None:
+            cases.append(("create_globe_visualization",
+                          lambda _: create_globe_visualization(connected, ley_lines, radius), None))
+        cases.append(("save_to_file", lambda _: save_to_file(data, output_file), None))
+
+        for name, function, setup in cases:
+            record(name, function, setup, item["label"], count, len(ley_lines))
+
+    for frequency in frequencies:
+        label = f"geodesic-{frequency}"
+        radius = 6371
+        # A half circumference keeps every mesh edge
+        generate = lambda _: generate_nodes_and_ley_lines("geodesic", radius, math.pi * radius,
+                                                          frequency=frequency, as_arrays=True)
+        network = generate(None)
+        output_file = os.path.join(output_dir, f"{label}.json")
+        record("generate_nodes_and_ley_lines", generate, None, label, network.num_nodes, network.num_ley_lines)
+        record("save_to_file", lambda _: save_to_file(network, output_file), None,
+               label, network.num_nodes, network.num_ley_lines)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {
+        "format_version": BENCHMARK_FORMAT_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "settings": {
+            "sizes": list(sizes),
+            "frequencies": list(frequencies),
+            "max_distance": max_distance,
+            "repeat": repeat,
+            "method": method
+        },
+        "results": results
+    }
+
+def _ratio(current, reference):
+    if current is None or reference is None:
+        return None
+    return current / reference if reference > 0 else math.inf
+
+def compare_reports(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+                    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD) -> list:
+    """
+    Compare two benchmark reports.
+
+    A benchmark regresses when its median time grows by more than ``threshold``
+    (a fraction: 0.25 means 25 % slower) relative to the baseline, and regresses in
+    memory when its peak memory grows by more than ``memory_threshold``. Memory is
+    only compared when both reports measured it.
+
+    Returns:
+        list: One dictionary per benchmark present in both reports with 'benchmark',
+              'input', 'baseline_seconds', 'current_seconds', 'ratio', 'regression',
+              'baseline_peak_memory_bytes', 'current_peak_memory_bytes', 'memory_ratio'
+              (None when not measured) and 'memory_regression'.
+    """
+    baseline_results = {(r["benchmark"], r["input"]): r for r in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        reference = baseline_results.get((result["benchmark"], result["input"]))
+        if reference is None:
+            continue
+        ratio = _ratio(result["seconds"], reference["seconds"])
+        memory_ratio = _ratio(result.get("peak_memory_bytes"), reference.get("peak_memory_bytes"))
+        comparisons.append({
+            "benchmark": result["benchmark"],
+            "input": result["input"],
+            "baseline_seconds": reference["seconds"],
+            "current_seconds": result["seconds"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+            "baseline_peak_memory_bytes": reference.get("peak_memory_bytes"),
+            "current_peak_memory_bytes": result.get("peak_memory_bytes"),
+            "memory_ratio": memory_ratio,
+            "memory_regression": memory_ratio is not None and memory_ratio > 1 + memory_threshold
+        })
+    return comparisons
+
+def _format_comparison(comparisons: list) -> str:
+    lines = [f"{'benchmark':<32} {'input':<28} {'baseline':>10} {'current':>10} {'ratio':>7} {'memory':>7}"]
+    for c in comparisons:
+        memory = f"{c['memory_ratio']:>7.2f}" if c["memory_ratio"] is not None else f"{'-':>7}"
+        flags = [label for label, flagged in (("REGRESSION", c["regression"]),
+                                              ("MEMORY REGRESSION", c["memory_regression"])) if flagged]
+        flag = "  " + ", ".join(flags) if flags else ""
+        lines.append(f"{c['benchmark']:<32} {c['input']:<28} {c['baseline_seconds']:>10.4f} "
+                     f"{c['current_seconds']:>10.4f} {c['ratio']:>7.2f} {memory}{flag}")
+    return "\n".join(lines)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ley line generation, connection, validation and rendering.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite and write a JSON report.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                            help="Node counts of the synthetic ladder")
+    run_parser.add_argument("--frequencies", type=int, nargs="*", default=list(DEFAULT_FREQUENCIES),
+                            help="Geodesic frequencies of the generation ladder (none to skip)")
+    run_parser.add_argument("--max-distance", type=float, default=1000, help="Connection distance for synthetic nodes (km)")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed calls per benchmark")
+    run_parser.add_argument("--method", choices=CONNECTION_METHODS, default="auto", help="connect_nodes strategy")
+    run_parser.add_argument("--no-render", action="store_true", help="Skip create_globe_visualization")
+    run_parser.add_argument("--no-memory", action="store_true", help="Skip peak memory measurement")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Report path")
+    run_parser.add_argument("--baseline", help="Compare against this report after running")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Allowed slowdown as a fraction before flagging a regression")
+    run_parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                            help="Allowed peak memory growth as a fraction before flagging a regression")
+
+    compare_parser = commands.add_parser("compare", help="Compare a report against a baseline report.")
+    compare_parser.add_argument("baseline", help="Baseline report")
+    compare_parser.add_argument("current", help="Current report")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed slowdown as a fraction before flagging a regression")
+    compare_parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                                help="Allowed peak memory growth as a fraction before flagging a regression")
+
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.command == "run":
+        report = run_benchmarks(args.sizes, args.max_distance, args.repeat, args.method,
+                                render=not args.no_render, memory=not args.no_memory,
+                                progress=lambda message: print(f"Running {message}", file=sys.stderr),
+                                frequencies=args.frequencies)
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Benchmark report written to {args.output}")
+        if not args.baseline:
+            return 0
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        current = report
+    else:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        with open(args.current, "r") as f:
+            current = json.load(f)
+
+    comparisons = compare_reports(baseline, current, args.threshold, args.memory_threshold)
+    print(_format_comparison(comparisons))
+    regressions = [c for c in comparisons if c["regression"]]
+    memory_regressions = [c for c in comparisons if c["memory_regression"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+    if memory_regressions:
+        print(f"{len(memory_regressions)} benchmark(s) grew peak memory by more than {args.memory_threshold:.0%}.")
+    return 1 if regressions or memory_regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
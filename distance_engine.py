@@ -0,0 +1,654 @@
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Number of pair distances evaluated per block. 65536 float64 values keep each
+# intermediate array at 512 KiB, which fits comfortably in L2 cache.
+DEFAULT_BLOCK_PAIRS = 65536
+
+# Bins per histogram of rejected pair distances
+REJECTION_HISTOGRAM_BINS = 20
+
+def node_coordinate_arrays(nodes: list) -> tuple:
+    """
+    Convert node coordinates to latitude and longitude arrays in radians.
+
+    Args:
+        nodes (list): List of node dictionaries.
+
+    Returns:
+        tuple: (numpy.ndarray, numpy.ndarray) - (latitudes, longitudes) in radians.
+    """
+    count = len(nodes)
+    lat = np.fromiter((node['coordinates']['latitude'] for node in nodes), dtype=np.float64, count=count)
+    lon = np.fromiter((node['coordinates']['longitude'] for node in nodes), dtype=np.float64, count=count)
+    return np.radians(lat), np.radians(lon)
+
+def unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Convert latitude and longitude arrays (radians) to unit vectors.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+
+    Returns:
+        numpy.ndarray: Array of shape (n, 3) with x, y, z on the unit sphere.
+    """
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+def haversine_distances(lat1, lon1, lat2, lon2, radius: float) -> np.ndarray:
+    """
+    Vectorized haversine distance between broadcastable coordinate arrays.
+
+    Mirrors the scalar formula used by connect_nodes, including clamping of the
+    haversine term to [0, 1] for numerical stability.
+
+    Args:
+        lat1, lon1, lat2, lon2: Coordinates in radians (arrays or scalars).
+        radius (float): Radius of the sphere in kilometers.
+
+    Returns:
+        numpy.ndarray: Great-circle distances in kilometers.
+    """
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    np.clip(a, 0.0, 1.0, out=a)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return radius * c
+
+def iter_distance_blocks(lat: np.ndarray, lon: np.ndarray, radius: float,
+                         block_pairs: int = DEFAULT_BLOCK_PAIRS,
+                         start: int = 0, stop: int = None):
+    """
+    Yield great-circle distances for all node pairs (i, j) with i < j in row blocks.
+
+    Pairs are produced in the same row-major order as the scalar double loop, so
+    concatenating the blocks reproduces the ley line numbering of connect_nodes.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+        radius (float): Radius of the sphere in kilometers.
+        block_pairs (int): Approximate number of pair distances computed per block.
+        start (int): First row index (inclusive) to evaluate.
+        stop (int): Last row index (exclusive) to evaluate. Defaults to all rows.
+
+    Yields:
+        tuple: (rows, cols, distances) arrays for the pairs of one block.
+    """
+    num_nodes = len(lat)
+    stop = num_nodes if stop is None else min(stop, num_nodes)
+    rows_per_block = max(1, block_pairs // max(num_nodes, 1))
+    cos_lat = np.cos(lat)
+
+    for i0 in range(start, stop, rows_per_block):
+        i1 = min(i0 + rows_per_block, stop)
+        if i0 + 1 >= num_nodes:
+            break
+        row_idx = np.arange(i0, i1)
+        col_idx = np.arange(i0 + 1, num_nodes)
+
+        dlat = lat[col_idx][np.newaxis, :] - lat[row_idx][:, np.newaxis]
+        dlon = lon[col_idx][np.newaxis, :] - lon[row_idx][:, np.newaxis]
+        a = np.sin(dlat / 2) ** 2 + cos_lat[row_idx][:, np.newaxis] * cos_lat[col_idx][np.newaxis, :] * np.sin(dlon / 2) ** 2
+        np.clip(a, 0.0, 1.0, out=a)
+        distances = radius * (2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+
+        mask = col_idx[np.newaxis, :] > row_idx[:, np.newaxis]
+        r, c = np.nonzero(mask)
+        yield row_idx[r], col_idx[c], distances[r, c]
+
+def find_pairs_in_range(lat: np.ndarray, lon: np.ndarray, radius: float,
+                        min_distance: float, max_distance: float,
+                        block_pairs: int = DEFAULT_BLOCK_PAIRS) -> tuple:
+    """
+    Find all node pairs whose great-circle distance lies in [min_distance, max_distance].
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+        radius (float): Radius of the sphere in kilometers.
+        min_distance (float): Minimum distance (inclusive) in kilometers.
+        max_distance (float): Maximum distance (inclusive) in kilometers.
+        block_pairs (int): Approximate number of pair distances computed per block.
+
+    Returns:
+        tuple: (rows, cols, distances) arrays in row-major pair order.
+    """
+    found_rows, found_cols, found_dist = [], [], []
+    for rows, cols, distances in iter_distance_blocks(lat, lon, radius, block_pairs):
+        keep = (distances >= min_distance) & (distances <= max_distance)
+        found_rows.append(rows[keep])
+        found_cols.append(cols[keep])
+        found_dist.append(distances[keep])
+
+    if not found_rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), np.empty(0, dtype=np.float64)
+    return np.concatenate(found_rows), np.concatenate(found_cols), np.concatenate(found_dist)
+
+# Coordinates attached by each worker process of find_pairs_in_range_parallel
+_worker_coordinates = None
+
+def _attach_shared_coordinates(name: str, num_nodes: int):
+    """Process pool initializer: map the shared coordinate block into this worker."""
+    global _worker_coordinates
+    # Pool workers share the parent's resource tracker, which unlinks the block once
+    block = shared_memory.SharedMemory(name=name)
+    _worker_coordinates = (block, np.ndarray((2, num_nodes), dtype=np.float64, buffer=block.buf))
+
+def _find_pairs_shard(task: tuple) -> tuple:
+    """Evaluate the pairs of rows [start, stop) against the shared coordinates."""
+    start, stop, radius, min_distance, max_distance, block_pairs = task
+    coordinates = _worker_coordinates[1]
+    found_rows, found_cols, found_dist = [], [], []
+    for rows, cols, distances in iter_distance_blocks(coordinates[0], coordinates[1], radius,
+                                                      block_pairs, start, stop):
+        keep = (distances >= min_distance) & (distances <= max_distance)
+        found_rows.append(rows[keep].astype(np.int32))
+        found_cols.append(cols[keep].astype(np.int32))
+        found_dist.append(distances[keep])
+    if not found_rows:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+    return np.concatenate(found_rows), np.concatenate(found_cols), np.concatenate(found_dist)
+
+def balanced_row_shards(num_nodes: int, num_shards: int) -> list:
+    """
+    Split the row range of the i < j pair loop into shards with similar pair counts.
+
+    Row i holds n - 1 - i pairs, so equal-width row ranges would leave the first
+    shard with most of the work.
+
+    Args:
+        num_nodes (int): Number of nodes.
+        num_shards (int): Desired number of shards.
+
+    Returns:
+        list: Ordered (start, stop) row ranges covering [0, num_nodes).
+    """
+    if num_nodes == 0:
+        return []
+    cumulative = np.cumsum(np.arange(num_nodes - 1, -1, -1, dtype=np.int64))
+    targets = cumulative[-1] * np.arange(1, num_shards) / num_shards
+    bounds = np.unique(np.concatenate(([0], np.searchsorted(cumulative, targets) + 1, [num_nodes])))
+    bounds = np.minimum(bounds, num_nodes)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+def find_pairs_in_range_parallel(lat: np.ndarray, lon: np.ndarray, radius: float,
+                                 min_distance: float, max_distance: float,
+                                 workers: int = None,
+                                 block_pairs: int = DEFAULT_BLOCK_PAIRS) -> tuple:
+    """
+    Process-pool version of find_pairs_in_range.
+
+    Coordinates are placed in a shared memory block that every worker maps instead
+    of receiving a pickled copy. The row range is split into pair-balanced shards,
+    and shard results are concatenated in row order, so the output (and therefore the
+    ley line numbering) is identical to the serial engine regardless of worker count.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+        radius (float): Radius of the sphere in kilometers.
+        min_distance (float): Minimum distance (inclusive) in kilometers.
+        max_distance (float): Maximum distance (inclusive) in kilometers.
+        workers (int): Number of worker processes. Defaults to os.cpu_count().
+        block_pairs (int): Approximate number of pair distances computed per block.
+
+    Returns:
+        tuple: (rows, cols, distances) arrays in row-major pair order.
+    """
+    num_nodes = len(lat)
+    workers = workers or os.cpu_count() or 1
+    # A few shards per worker keep all processes busy until the end
+    shards = balanced_row_shards(num_nodes, workers * 4)
+    if not shards:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), np.empty(0, dtype=np.float64)
+
+    block = shared_memory.SharedMemory(create=True, size=max(1, 2 * num_nodes * 8))
+    try:
+        coordinates = np.ndarray((2, num_nodes), dtype=np.float64, buffer=block.buf)
+        coordinates[0] = lat
+        coordinates[1] = lon
+        tasks = [(start, stop, radius, min_distance, max_distance, block_pairs) for start, stop in shards]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared_coordinates,
+                                 initargs=(block.name, num_nodes)) as pool:
+            results = list(pool.map(_find_pairs_shard, tasks))
+        del coordinates
+    finally:
+        block.close()
+        block.unlink()
+
+    rows = np.concatenate([r[0] for r in results]).astype(np.int64)
+    cols = np.concatenate([r[1] for r in results]).astype(np.int64)
+    return rows, cols, np.concatenate([r[2] for r in results])
+
+def histogram_distance_statistics(lat: np.ndarray, lon: np.ndarray, radius: float,
+                                  max_error: float = 1.0,
+                                  block_pairs: int = DEFAULT_BLOCK_PAIRS) -> dict:
+    """
+    Minimum and median pair distance from one streaming pass with bounded memory.
+
+    Distances are never stored: each block is folded into a fixed-width histogram
+    over [0, pi * radius] (a mergeable sketch) and a running minimum. The median is
+    the midpoint of the bin holding the middle rank, so its absolute error is at most
+    half a bin width, i.e. max_error.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+        radius (float): Radius of the sphere in kilometers.
+        max_error (float): Largest tolerated absolute error of the median in kilometers.
+        block_pairs (int): Approximate number of pair distances computed per block.
+
+    Returns:
+        dict: 'count', 'min_distance' (exact), 'median_distance' and 'median_error' (bound in km).
+
+    Raises:
+        ValueError: If max_error is not positive.
+    """
+    if max_error <= 0:
+        raise ValueError("max_error must be a positive number.")
+    bin_width = 2 * max_error
+    num_bins = max(1, math.ceil(math.pi * radius / bin_width))
+    counts = np.zeros(num_bins, dtype=np.int64)
+    min_distance = math.inf
+
+    for _, _, distances in iter_distance_blocks(lat, lon, radius, block_pairs):
+        if len(distances) == 0:
+            continue
+        min_distance = min(min_distance, float(distances.min()))
+        bins = np.minimum((distances / bin_width).astype(np.int64), num_bins - 1)
+        counts += np.bincount(bins, minlength=num_bins)
+
+    total = int(counts.sum())
+    if total == 0:
+        return {'count': 0}
+    cumulative = np.cumsum(counts)
+    # Middle rank(s) of the sorted distances, averaged for an even count like statistics.median
+    middle = [(total - 1) // 2, total // 2]
+    midpoints = [(int(np.searchsorted(cumulative, rank, side='right')) + 0.5) * bin_width for rank in middle]
+    return {
+        'count': total,
+        'min_distance': min_distance,
+        'median_distance': sum(midpoints) / 2,
+        'median_error': max_error
+    }
+
+def rejected_distance_histogram(distance_blocks, radius: float, min_distance: float, max_distance: float,
+                                bins: int = REJECTION_HISTOGRAM_BINS) -> dict:
+    """
+    Histograms of the pair distances that fall outside [min_distance, max_distance].
+
+    Each block is folded into two fixed-range histograms, one over [0, min_distance)
+    and one over (max_distance, pi * radius], so memory stays bounded however many
+    pairs are streamed through.
+
+    Args:
+        distance_blocks: Iterable of distance arrays in kilometers.
+        radius (float): Radius of the sphere in kilometers.
+        min_distance (float): Lower bound of the accepted range.
+        max_distance (float): Upper bound of the accepted range.
+        bins (int): Number of bins per histogram.
+
+    Returns:
+        dict: 'below_min' and 'above_max', each with 'count', 'bin_edges' and 'counts' (lists).
+    """
+    ranges = {
+        'below_min': (0.0, max(min_distance, 0.0)),
+        'above_max': (max_distance, max(math.pi * radius, max_distance))
+    }
+    counts = {name: np.zeros(bins, dtype=np.int64) for name in ranges}
+    for distances in distance_blocks:
+        distances = np.asarray(distances)
+        for name, selected in (('below_min', distances[distances < min_distance]),
+                               ('above_max', distances[distances > max_distance])):
+            if len(selected):
+                counts[name] += np.histogram(selected, bins=bins, range=ranges[name])[0]
+    return {
+        name: {
+            'count': int(counts[name].sum()),
+            'bin_edges': np.linspace(low, high, bins + 1).tolist(),
+            'counts': counts[name].tolist()
+        }
+        for name, (low, high) in ranges.items()
+    }
+
+def sampled_distance_statistics(lat: np.ndarray, lon: np.ndarray, radius: float,
+                                rank_error: float = 0.01, confidence: float = 0.99,
+                                seed: int = 0) -> dict:
+    """
+    Estimate the median pair distance from a uniform random sample of node pairs.
+
+    The sample size follows the Dvoretzky-Kiefer-Wolfowitz bound, so with the given
+    confidence the estimate's rank is within rank_error of the true median regardless
+    of the number of nodes. Cost is independent of the O(n^2) pair count.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+        radius (float): Radius of the sphere in kilometers.
+        rank_error (float): Tolerated error of the median as a fraction of all pairs.
+        confidence (float): Probability that the rank error bound holds.
+        seed (int): Seed of the pair sampler, fixed by default for reproducible suggestions.
+
+    Returns:
+        dict: 'count' (pairs represented), 'sample_size', 'median_distance' and
+              'median_interval' (distances at median -/+ rank_error in the sample).
+
+    Raises:
+        ValueError: If rank_error or confidence is outside (0, 1).
+    """
+    if not 0 < rank_error < 1 or not 0 < confidence < 1:
+        raise ValueError("rank_error and confidence must lie strictly between 0 and 1.")
+    num_nodes = len(lat)
+    total = num_nodes * (num_nodes - 1) // 2
+    if total == 0:
+        return {'count': 0}
+
+    sample_size = min(total, math.ceil(math.log(2 / (1 - confidence)) / (2 * rank_error ** 2)))
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, num_nodes, sample_size)
+    cols = rng.integers(0, num_nodes - 1, sample_size)
+    cols += cols >= rows  # uniform over distinct pairs
+    sample = np.sort(haversine_distances(lat[rows], lon[rows], lat[cols], lon[cols], radius))
+
+    low, high = np.quantile(sample, [max(0.0, 0.5 - rank_error), min(1.0, 0.5 + rank_error)])
+    return {
+        'count': total,
+        'sample_size': sample_size,
+        'median_distance': float(np.median(sample)),
+        'median_interval': [float(low), float(high)]
+    }
+
+# Largest number of node pairs whose distances are computed exactly and kept in memory
+# (8 bytes per pair, 24 once sorted, so a single set takes up to 480 MB)
+MAX_CACHED_PAIRS = 20_000_000
+
+# Total bytes the shared distance cache may hold, sorted candidates included
+DISTANCE_CACHE_BYTES = 512 * 1024 * 1024
+
+class PairwiseDistances:
+    """
+    Central angles between all node pairs, computed in one blocked pass.
+
+    Angles are stored on the unit sphere in condensed row-major order (pairs (i, j)
+    with i < j, exactly as connect_nodes walks them), so a single pass serves any
+    radius: distances are ``angle * radius``, which is bit-identical to evaluating
+    the haversine formula with that radius directly.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, block_pairs: int = DEFAULT_BLOCK_PAIRS):
+        """
+        Args:
+            lat (numpy.ndarray): Latitudes in radians.
+            lon (numpy.ndarray): Longitudes in radians.
+            block_pairs (int): Approximate number of pair distances computed per block.
+        """
+        self.num_nodes = len(lat)
+        blocks = [angles for _, _, angles in iter_distance_blocks(lat, lon, 1.0, block_pairs)]
+        self.angles = np.concatenate(blocks) if blocks else np.empty(0, dtype=np.float64)
+        # Condensed index of the first pair of every row
+        row_lengths = np.arange(self.num_nodes - 1, -1, -1, dtype=np.int64)
+        self.row_start = np.concatenate(([0], np.cumsum(row_lengths)[:-1])) if self.num_nodes else row_lengths
+        # (condensed order by angle, sorted angles), built on demand by sort_candidates;
+        # the lock keeps threads sharing a cached instance from sorting twice
+        self._sorted = None
+        self._range_queries = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    @property
+    def max_nbytes(self) -> int:
+        """Memory held once the candidates are sorted: angles, sort order and sorted angles."""
+        return 3 * self.angles.nbytes + self.row_start.nbytes
+
+    def distances(self, radius: float) -> np.ndarray:
+        """
+        Distances of all pairs in condensed order.
+
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+
+        Returns:
+            numpy.ndarray: Great-circle distances in kilometers.
+        """
+        return self.angles * radius
+
+    def pair_indices(self, condensed: np.ndarray) -> tuple:
+        """
+        Convert condensed pair positions to (row, col) node indices.
+
+        Args:
+            condensed (numpy.ndarray): Positions in the condensed pair order.
+
+        Returns:
+            tuple: (rows, cols) arrays.
+        """
+        rows = np.searchsorted(self.row_start, condensed, side='right') - 1
+        cols = condensed - self.row_start[rows] + rows + 1
+        return rows, cols
+
+    def condensed_index(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Condensed pair position of node index pairs (order of each pair is ignored).
+
+        Args:
+            rows (numpy.ndarray): First node index of each pair.
+            cols (numpy.ndarray): Second node index of each pair.
+
+        Returns:
+            numpy.ndarray: Positions in the condensed pair order.
+        """
+        lo = np.minimum(rows, cols)
+        hi = np.maximum(rows, cols)
+        return self.row_start[lo] + (hi - lo - 1)
+
+    def distances_between(self, rows: np.ndarray, cols: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Distances between the given node index pairs, looked up without recomputation.
+
+        Args:
+            rows (numpy.ndarray): First node index of each pair.
+            cols (numpy.ndarray): Second node index of each pair.
+            radius (float): Radius of the sphere in kilometers.
+
+        Returns:
+            numpy.ndarray: Great-circle distances in kilometers (0 for a node paired with itself).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        distinct = rows != cols
+        result = np.zeros(len(rows), dtype=np.float64)
+        result[distinct] = self.angles[self.condensed_index(rows[distinct], cols[distinct])] * radius
+        return result
+
+    def sort_candidates(self) -> tuple:
+        """
+        Order all pairs by distance, once; later range queries become binary searches.
+
+        Returns:
+            tuple: (order, sorted_angles) where order lists condensed pair positions by
+                   increasing angle and sorted_angles = angles[order].
+        """
+        with self._lock:
+            if self._sorted is None:
+                order = np.argsort(self.angles, kind='stable')
+                self._sorted = (order, self.angles[order])
+            return self._sorted
+
+    @staticmethod
+    def _rank(sorted_angles: np.ndarray, radius: float, distance: float, inclusive: bool) -> int:
+        # Number of pairs with angle * radius < distance (or <= when inclusive). The search
+        # runs on angles; the short walks fix rounding so the cut matches pairs_in_range exactly.
+        k = int(np.searchsorted(sorted_angles, distance / radius, side='right' if inclusive else 'left'))
+        inside = (lambda value: value <= distance) if inclusive else (lambda value: value < distance)
+        while k > 0 and not inside(sorted_angles[k - 1] * radius):
+            k -= 1
+        while k < len(sorted_angles) and inside(sorted_angles[k] * radius):
+            k += 1
+        return k
+
+    def pairs_in_range(self, radius: float, min_distance: float, max_distance: float, stats: dict = None) -> tuple:
+        """
+        All pairs whose distance lies in [min_distance, max_distance], in row-major order.
+
+        The first query scans all pairs. From the second query on (typically a
+        re-connection with a new min or max distance) the pairs are sorted by distance
+        once, and every query is a binary search plus a slice of the k matching pairs.
+        Both paths return identical results.
+
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+            min_distance (float): Minimum distance (inclusive) in kilometers.
+            max_distance (float): Maximum distance (inclusive) in kilometers.
+            stats (dict): Optional dictionary; 'candidates' is set to the number of pairs
+                          whose distance was compared (all pairs for a scan, the matching
+                          slice for a sorted lookup).
+
+        Returns:
+            tuple: (rows, cols, distances) arrays, matching find_pairs_in_range.
+        """
+        with self._lock:
+            self._range_queries += 1
+            scan = self._sorted is None and self._range_queries < 2
+        if scan:
+            distances = self.distances(radius)
+            condensed = np.nonzero((distances >= min_distance) & (distances <= max_distance))[0]
+            rows, cols = self.pair_indices(condensed)
+            if stats is not None:
+                stats['candidates'] = len(distances)
+            return rows, cols, distances[condensed]
+
+        order, sorted_angles = self.sort_candidates()
+        start = self._rank(sorted_angles, radius, min_distance, inclusive=False)
+        stop = self._rank(sorted_angles, radius, max_distance, inclusive=True)
+        condensed = np.sort(order[start:max(start, stop)]).astype(np.int64)
+        rows, cols = self.pair_indices(condensed)
+        if stats is not None:
+            stats['candidates'] = len(condensed)
+        return rows, cols, self.angles[condensed] * radius
+
+    def median_and_min(self, radius: float) -> tuple:
+        """
+        Median and minimum pair distance, read off the sorted candidates when available.
+
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+
+        Returns:
+            tuple: (median, minimum) in kilometers, equal to np.median and min of distances(radius).
+        """
+        candidates = self._sorted
+        if candidates is None:
+            distances = self.distances(radius)
+            return float(np.median(distances)), float(distances.min())
+        sorted_angles = candidates[1]
+        count = len(sorted_angles)
+        middle = sorted_angles[(count - 1) // 2:count // 2 + 1] * radius
+        return float(np.mean(middle)), float(sorted_angles[0] * radius)
+
+class DistanceCache:
+    """
+    Bounded LRU cache of PairwiseDistances keyed by the node coordinate set.
+
+    The key is a digest of the latitude and longitude arrays, so every consumer that
+    sees the same nodes (generation, suggestions, validation) shares one distance pass
+    regardless of the radius it works with. Entries are charged at their sorted size
+    (PairwiseDistances.max_nbytes), since any of them may be sorted after it is cached.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = DISTANCE_CACHE_BYTES):
+        """
+        Args:
+            max_entries (int): Number of node sets kept before the least recently used is evicted.
+            max_bytes (int): Total memory of the cached entries; least recently used entries are
+                             evicted to stay below it, and larger node sets are computed but not cached.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(lat: np.ndarray, lon: np.ndarray) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(lat, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(lon, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def peek(self, lat: np.ndarray, lon: np.ndarray):
+        """
+        Return the cached distances for these coordinates without computing them.
+
+        Returns:
+            PairwiseDistances or None: Cached result, if any.
+        """
+        key = self.key(lat, lon)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def get(self, lat: np.ndarray, lon: np.ndarray) -> PairwiseDistances:
+        """
+        Return distances for these coordinates, computing and caching them on a miss.
+
+        Args:
+            lat (numpy.ndarray): Latitudes in radians.
+            lon (numpy.ndarray): Longitudes in radians.
+
+        Returns:
+            PairwiseDistances: Shared distance result.
+        """
+        entry = self.peek(lat, lon)
+        if entry is not None:
+            return entry
+        entry = PairwiseDistances(lat, lon)
+        with self._lock:
+            self.misses += 1
+            key = self.key(lat, lon)
+            if entry.max_nbytes <= self.max_bytes and key not in self._entries:
+                self._entries[key] = entry
+                self.nbytes += entry.max_nbytes
+                while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                    self.nbytes -= self._entries.popitem(last=False)[1].max_nbytes
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+# Process-wide cache shared by generation, suggestion and validation
+distance_cache = DistanceCache()
+
+def get_pairwise_distances(lat: np.ndarray, lon: np.ndarray) -> PairwiseDistances:
+    """
+    Shared pairwise distances for a node set, computed at most once while cached.
+
+    Args:
+        lat (numpy.ndarray): Latitudes in radians.
+        lon (numpy.ndarray): Longitudes in radians.
+
+    Returns:
+        PairwiseDistances: Distance result from the process-wide cache.
+    """
+    return distance_cache.get(lat, lon)
@@ -0,0 +1,285 @@
+import math
+import numpy as np
+
+from distance_engine import haversine_distances, unit_vectors
+from network_arrays import NetworkArrays
+from spatial_index import distance_to_chord, grid_cells, neighbor_cells
+
+class DynamicNetwork:
+    """
+    Mutable ley line network with incremental edge maintenance.
+
+    Nodes live in a sparse 3D cell grid (a dict from cell to node ids) laid out like
+    spatial_index.SphereGrid, with cells as wide as the chord of max_distance, so every
+    node within range of a point is found in the 27 surrounding cells. Adding, removing or moving a node only
+    touches those cells and the node's own ley lines: O(k) dictionary work for k
+    nearby nodes instead of regenerating the whole network.
+
+    Each node's ley lines and neighbours are kept in insertion-ordered dicts, so
+    linking and unlinking a line is O(1); the legacy ``associated_ley_lines`` and
+    ``nearby_nodes`` lists are only built by to_dict(). Node and ley line ids are
+    never reused, so ids held by callers stay valid until their node or line is removed.
+    """
+
+    def __init__(self, radius: float = 6371, max_distance: float = 5000, min_distance: float = 0.0,
+                 metadata: dict = None):
+        """
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+            max_distance (float): Maximum distance between connected nodes in kilometers.
+            min_distance (float): Minimum distance between connected nodes in kilometers.
+            metadata (dict): Metadata carried over to to_dict().
+
+        Raises:
+            ValueError: If the radius or distances are invalid.
+        """
+        if radius <= 0:
+            raise ValueError("Radius must be a positive number.")
+        if max_distance <= 0:
+            raise ValueError("Max distance must be a positive number.")
+        if min_distance < 0 or min_distance > max_distance:
+            raise ValueError("Min distance must lie between 0 and max_distance.")
+        self.radius = float(radius)
+        self.max_distance = float(max_distance)
+        self.min_distance = float(min_distance)
+        self.metadata = dict(metadata) if metadata else {}
+
+        # Slight inflation guards pairs sitting exactly on max_distance
+        self.cell_size = max(distance_to_chord(self.max_distance, self.radius) * (1 + 1e-9), 1e-9)
+        self.nodes = {}
+        self.ley_lines = {}
+        self._cells = {}
+        self._cell_of = {}
+        self._coordinates = {}
+        self._line_between = {}
+        self._lines_of = {}
+        self._neighbors_of = {}
+        self._sequence = {}
+        self._inserted = 0
+        self._next_node = 0
+        self._next_line = 0
+
+    @classmethod
+    def from_network(cls, data, radius: float = 6371, max_distance: float = 5000,
+                     min_distance: float = 0.0) -> 'DynamicNetwork':
+        """
+        Start from an existing network, keeping its nodes and ley lines as they are.
+
+        Later changes connect the touched nodes by the distance rule of this network.
+
+        Args:
+            data: Legacy nodes/ley_lines dictionary or NetworkArrays.
+            radius (float): Radius of the sphere in kilometers.
+            max_distance (float): Maximum distance between connected nodes in kilometers.
+            min_distance (float): Minimum distance between connected nodes in kilometers.
+
+        Returns:
+            DynamicNetwork: Network holding copies of the given nodes and ley lines.
+
+        Raises:
+            ValueError: If two nodes or two ley lines share an id.
+        """
+        network = cls(radius, max_distance, min_distance, data.get('metadata'))
+        for node in data['nodes']:
+            coordinates = node['coordinates']
+            network._insert(node['id'], coordinates['latitude'], coordinates['longitude'], node['category'])
+        for line in data['ley_lines']:
+            network._link(line['nodes'][0], line['nodes'][1], line['id'], line['category'])
+        network._next_node = len(network.nodes)
+        network._next_line = len(network.ley_lines)
+        return network
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple:
+        xyz = unit_vectors(math.radians(latitude), math.radians(longitude))[0]
+        return tuple(grid_cells(xyz, self.cell_size).tolist())
+
+    def _insert(self, node_id: str, latitude: float, longitude: float, category: str):
+        if node_id in self.nodes:
+            raise ValueError(f"Node id '{node_id}' already exists.")
+        self.nodes[node_id] = {
+            "id": node_id,
+            "coordinates": {"latitude": latitude, "longitude": longitude},
+            "category": category
+        }
+        self._lines_of[node_id] = {}
+        self._neighbors_of[node_id] = {}
+        self._sequence[node_id] = self._inserted
+        self._inserted += 1
+        self._place(node_id, latitude, longitude)
+
+    def _place(self, node_id: str, latitude: float, longitude: float):
+        cell = self._cell(latitude, longitude)
+        self._cells.setdefault(cell, set()).add(node_id)
+        self._cell_of[node_id] = cell
+        self._coordinates[node_id] = (math.radians(latitude), math.radians(longitude))
+
+    def _unplace(self, node_id: str):
+        cell = self._cell_of.pop(node_id)
+        members = self._cells[cell]
+        members.discard(node_id)
+        if not members:
+            del self._cells[cell]
+        del self._coordinates[node_id]
+
+    def _link(self, id_a: str, id_b: str, line_id: str = None, category: str = None) -> str:
+        node_a = self.nodes[id_a]
+        node_b = self.nodes[id_b]
+        if line_id is None:
+            while f"leyline_{self._next_line:03}" in self.ley_lines:
+                self._next_line += 1
+            line_id = f"leyline_{self._next_line:03}"
+            self._next_line += 1
+        elif line_id in self.ley_lines:
+            raise ValueError(f"Ley line id '{line_id}' already exists.")
+        if category is None:
+            category = "primary" if node_a['category'] == "major_node" and node_b['category'] == "major_node" else "secondary"
+        self.ley_lines[line_id] = {"id": line_id, "nodes": [id_a, id_b], "category": category}
+        between = self._line_between.setdefault(frozenset((id_a, id_b)), {})
+        between[line_id] = None
+        self._lines_of[id_a][line_id] = None
+        self._lines_of[id_b][line_id] = None
+        # The first line between two nodes makes them neighbours
+        if len(between) == 1:
+            self._neighbors_of[id_a][id_b] = None
+            self._neighbors_of[id_b][id_a] = None
+        return line_id
+
+    def _unlink(self, line_id: str):
+        line = self.ley_lines.pop(line_id)
+        id_a, id_b = line['nodes']
+        key = frozenset((id_a, id_b))
+        between = self._line_between[key]
+        del between[line_id]
+        del self._lines_of[id_a][line_id]
+        del self._lines_of[id_b][line_id]
+        if not between:
+            del self._line_between[key]
+            self._neighbors_of[id_a].pop(id_b, None)
+            self._neighbors_of[id_b].pop(id_a, None)
+
+    def neighbors_within(self, latitude: float, longitude: float, exclude: str = None) -> list:
+        """
+        Nodes whose distance to a point lies in [min_distance, max_distance].
+
+        Args:
+            latitude (float): Latitude in degrees.
+            longitude (float): Longitude in degrees.
+            exclude (str): Node id to leave out (e.g. the node at this point).
+
+        Returns:
+            list: (node_id, distance) tuples in node insertion order.
+        """
+        candidates = set()
+        for cell in neighbor_cells(self._cell(latitude, longitude)).tolist():
+            candidates.update(self._cells.get(tuple(cell), ()))
+        candidates.discard(exclude)
+        if not candidates:
+            return []
+
+        # Keep insertion order so new ley lines are numbered deterministically
+        ids = sorted(candidates, key=self._sequence.__getitem__)
+        coordinates = np.array([self._coordinates[node_id] for node_id in ids])
+        count = len(ids)
+        distances = haversine_distances(np.full(count, math.radians(latitude)), np.full(count, math.radians(longitude)),
+                                        coordinates[:, 0], coordinates[:, 1], self.radius)
+        keep = (distances >= self.min_distance) & (distances <= self.max_distance)
+        return [(node_id, float(distance)) for node_id, distance, kept in zip(ids, distances.tolist(), keep.tolist()) if kept]
+
+    def _connect(self, node_id: str):
+        coordinates = self.nodes[node_id]['coordinates']
+        for other, _ in self.neighbors_within(coordinates['latitude'], coordinates['longitude'], exclude=node_id):
+            if self._sequence[other] < self._sequence[node_id]:
+                self._link(other, node_id)
+            else:
+                self._link(node_id, other)
+
+    def add_node(self, latitude: float, longitude: float, category: str = "major_node", node_id: str = None) -> str:
+        """
+        Insert a node and connect it to every node within range.
+
+        Args:
+            latitude (float): Latitude in degrees.
+            longitude (float): Longitude in degrees.
+            category (str): Node category.
+            node_id (str): Id for the node; the next free node_NNN id when omitted.
+
+        Returns:
+            str: Id of the new node.
+
+        Raises:
+            ValueError: If the coordinates are out of range or the id is taken.
+        """
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Latitude must be in [-90, 90] and longitude in [-180, 180].")
+        if node_id is None:
+            while f"node_{self._next_node:03}" in self.nodes:
+                self._next_node += 1
+            node_id = f"node_{self._next_node:03}"
+            self._next_node += 1
+        self._insert(node_id, latitude, longitude, category)
+        self._connect(node_id)
+        return node_id
+
+    def remove_node(self, node_id: str):
+        """
+        Delete a node and its ley lines, updating the neighbours of the nodes it was joined to.
+
+        Raises:
+            KeyError: If the node does not exist.
+        """
+        for line_id in list(self._lines_of[node_id]):
+            self._unlink(line_id)
+        self._unplace(node_id)
+        del self._sequence[node_id]
+        del self._lines_of[node_id]
+        del self._neighbors_of[node_id]
+        del self.nodes[node_id]
+
+    def move_node(self, node_id: str, latitude: float, longitude: float):
+        """
+        Relocate a node: its ley lines are dropped and rebuilt for the new position.
+
+        Raises:
+            KeyError: If the node does not exist.
+            ValueError: If the coordinates are out of range.
+        """
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Latitude must be in [-90, 90] and longitude in [-180, 180].")
+        node = self.nodes[node_id]
+        for line_id in list(self._lines_of[node_id]):
+            self._unlink(line_id)
+        self._unplace(node_id)
+        node['coordinates'] = {"latitude": latitude, "longitude": longitude}
+        self._place(node_id, latitude, longitude)
+        self._connect(node_id)
+
+    def to_dict(self) -> dict:
+        """
+        Snapshot in the legacy format returned by generate_nodes_and_ley_lines.
+
+        Returns:
+            dict: Dictionary with 'nodes', 'ley_lines' and 'metadata'. Node dictionaries
+                  are built fresh with their ley line and neighbour lists; ley line
+                  dictionaries are shared with this network, not copied.
+        """
+        return {
+            "nodes": [{
+                **node,
+                "associated_ley_lines": list(self._lines_of[node_id]),
+                "nearby_nodes": list(self._neighbors_of[node_id])
+            } for node_id, node in self.nodes.items()],
+            "ley_lines": list(self.ley_lines.values()),
+            "metadata": self.metadata
+        }
+
+    def to_arrays(self) -> NetworkArrays:
+        """
+        Columnar snapshot. Node and ley line ids are preserved, also after removals.
+
+        Returns:
+            NetworkArrays: Copy of the current network.
+        """
+        return NetworkArrays.from_legacy(self.to_dict(), self.radius)
@@ -0,0 +1,210 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from ley_line_generator import GENERATOR_VERSION, generate_nodes_and_ley_lines
+
+logger = logging.getLogger(__name__)
+
+def copy_network(data: dict) -> dict:
+    """
+    Copy a legacy network dictionary deeply enough that callers may mutate it.
+
+    Specialised for the nodes/ley_lines layout, which is considerably faster than
+    copy.deepcopy on large networks.
+
+    Args:
+        data (dict): Dictionary with 'nodes', 'ley_lines' and 'metadata'.
+
+    Returns:
+        dict: Independent copy of the network.
+    """
+    return {
+        "nodes": [
+            {
+                **node,
+                "coordinates": dict(node["coordinates"]),
+                "associated_ley_lines": list(node["associated_ley_lines"]),
+                "nearby_nodes": list(node["nearby_nodes"])
+            }
+            for node in data["nodes"]
+        ],
+        "ley_lines": [{**line, "nodes": list(line["nodes"])} for line in data["ley_lines"]],
+        "metadata": json.loads(json.dumps(data.get("metadata", {})))
+    }
+
+class GenerationCache:
+    """
+    Bounded LRU cache in front of generate_nodes_and_ley_lines with an optional disk tier.
+
+    Entries are keyed on (solid_type, radius, max_distance, auto_adjust, frequency,
+    GENERATOR_VERSION). The cache keeps a private copy of every result and hands out
+    fresh copies, so callers (and connect_nodes-style in-place wiring) can never
+    corrupt a cached entry. When cache_dir is set, results are also written there as
+    gzip-compressed JSON and survive process restarts. The disk tier is LRU as well:
+    a file's mtime records when it was written (for ttl) and its atime when it was
+    last used, which decides eviction.
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: float = None, cache_dir: str = None,
+                 max_disk_entries: int = 256):
+        """
+        Args:
+            maxsize (int): Number of results kept in memory before the least recently used is evicted.
+            ttl (float): Seconds after which an entry expires (memory and disk). None disables expiry.
+            cache_dir (str): Directory of the disk tier. None keeps the cache in memory only.
+            max_disk_entries (int): Number of files kept in cache_dir before the least recently used are removed.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(solid_type: str, radius: float, max_distance: float, auto_adjust: bool = False,
+            frequency: int = 1) -> tuple:
+        return (solid_type, float(radius), float(max_distance), bool(auto_adjust), int(frequency), GENERATOR_VERSION)
+
+    def _disk_path(self, key: tuple) -> str:
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json.gz")
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _load_from_disk(self, key: tuple):
+        path = self._disk_path(key)
+        try:
+            created = os.path.getmtime(path)
+            if self._expired(created):
+                os.remove(path)
+                return None
+            with gzip.open(path, "rt") as file:
+                stored = json.load(file)
+            # Mark the file as used without extending its ttl
+            os.utime(path, (time.time(), created))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Discarding unreadable generation cache file %s.", path)
+            return None
+        return stored["data"] if stored.get("key") == list(key) else None
+
+    def _save_to_disk(self, key: tuple, data: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(key)
+        temp_file = path + '.tmp'
+        try:
+            with gzip.open(temp_file, "wt") as file:
+                json.dump({"key": list(key), "data": data}, file)
+            os.replace(temp_file, path)
+        except OSError:
+            logger.exception("Failed to write generation cache file %s.", path)
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return
+
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json.gz")]
+        if len(files) > self.max_disk_entries:
+            files.sort(key=os.path.getatime)
+            for stale in files[:len(files) - self.max_disk_entries]:
+                os.remove(stale)
+
+    def _store(self, key: tuple, data: dict):
+        self._entries[key] = (time.time(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_generate(self, solid_type: str = 'icosahedron', radius: float = 6371,
+                        max_distance: float = 5000, auto_adjust: bool = False,
+                        frequency: int = 1) -> dict:
+        """
+        Return the network for a configuration, generating it only on a cache miss.
+
+        Args:
+            solid_type (str): Type of Platonic solid or geodesic variant.
+            radius (float): Radius of the sphere in kilometers.
+            max_distance (float): Maximum distance between nodes to create ley lines.
+            auto_adjust (bool): Whether to automatically adjust parameters.
+            frequency (int): Subdivision frequency for geodesic solid types.
+
+        Returns:
+            dict: A private copy of the generated network that the caller may modify.
+        """
+        key = self.key(solid_type, radius, max_distance, auto_adjust, frequency)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_network(entry[1])
+            self._entries.pop(key, None)
+
+        data = self._load_from_disk(key) if self.cache_dir else None
+        if data is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, data)
+            return copy_network(data)
+
+        data = generate_nodes_and_ley_lines(
+            solid_type=solid_type,
+            radius=radius,
+            max_distance=max_distance,
+            auto_adjust=auto_adjust,
+            frequency=frequency
+        )
+        stored = copy_network(data)
+        with self._lock:
+            self.misses += 1
+            self._store(key, stored)
+        if self.cache_dir:
+            self._save_to_disk(key, stored)
+        return data
+
+    def clear(self, disk: bool = False):
+        """
+        Drop all in-memory entries, and the disk tier too when requested.
+
+        Args:
+            disk (bool): Also delete the cache files in cache_dir.
+        """
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json.gz"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+# Process-wide in-memory cache used when no explicit cache is given
+default_cache = GenerationCache()
+
+def cached_generate_nodes_and_ley_lines(solid_type: str = 'icosahedron', radius: float = 6371,
+                                        max_distance: float = 5000, auto_adjust: bool = False,
+                                        frequency: int = 1, cache: GenerationCache = None) -> dict:
+    """
+    Memoized generate_nodes_and_ley_lines.
+
+    Args:
+        solid_type (str): Type of Platonic solid or geodesic variant.
+        radius (float): Radius of the sphere in kilometers.
+        max_distance (float): Maximum distance between nodes to create ley lines.
+        auto_adjust (bool): Whether to automatically adjust parameters.
+        frequency (int): Subdivision frequency for geodesic solid types.
+        cache (GenerationCache): Cache to use. Defaults to the process-wide in-memory cache.
+
+    Returns:
+        dict: Generated network, safe for the caller to modify.
+    """
+    return (cache or default_cache).get_or_generate(solid_type, radius, max_distance, auto_adjust, frequency)
@@ -0,0 +1,209 @@
+from collections import namedtuple
+
+import numpy as np
+
+from platonic import get_platonic_table
+
+# Mesh on the unit sphere. ``edges`` holds sorted (i, j) index pairs with i < j in
+# lexicographic order; ``faces`` holds triangle vertex indices (None for Goldberg meshes,
+# whose faces are mixed pentagons and hexagons).
+GeodesicMesh = namedtuple('GeodesicMesh', ['vertices', 'edges', 'faces'])
+
+GEODESIC_VARIANTS = ('geodesic', 'goldberg')
+
+def _icosahedron() -> tuple:
+    """
+    Base icosahedron on the unit sphere, using the vertex order of generate_platonic_solid.
+
+    Returns:
+        tuple: (vertices, edges, faces) arrays.
+    """
+    vertices = get_platonic_table('icosahedron').vertices
+
+    # Edges join nearest neighbours; every vertex has exactly five of them
+    chords = np.linalg.norm(vertices[:, np.newaxis, :] - vertices[np.newaxis, :, :], axis=2)
+    edge_length = chords[chords > 0].min()
+    adjacent = np.isclose(chords, edge_length)
+    edges = np.argwhere(np.triu(adjacent))
+
+    faces = []
+    for a, b in edges:
+        for c in np.nonzero(adjacent[a] & adjacent[b])[0]:
+            if c > b:
+                faces.append((a, b, c))
+    return vertices, edges, np.array(faces, dtype=np.int64)
+
+def _edge_index(edges: np.ndarray, num_vertices: int) -> tuple:
+    """
+    Collapse triangle edges to unique undirected edges via an integer hash key.
+
+    Args:
+        edges (numpy.ndarray): Array of shape (m, 2) with possibly repeated vertex pairs.
+        num_vertices (int): Number of vertices, used to build the key.
+
+    Returns:
+        tuple: (unique_edges, inverse) where inverse maps each input edge to its unique edge.
+    """
+    lo = np.minimum(edges[:, 0], edges[:, 1]).astype(np.int64)
+    hi = np.maximum(edges[:, 0], edges[:, 1]).astype(np.int64)
+    keys, inverse = np.unique(lo * num_vertices + hi, return_inverse=True)
+    unique_edges = np.column_stack((keys // num_vertices, keys % num_vertices))
+    return unique_edges, inverse
+
+def geodesic_mesh(frequency: int) -> GeodesicMesh:
+    """
+    Build a frequency-N geodesic icosphere (class I subdivision of the icosahedron).
+
+    Every icosahedron edge is split into ``frequency`` segments and every face into
+    ``frequency ** 2`` triangles; the resulting 10 * N**2 + 2 vertices are projected
+    onto the unit sphere. Points on shared icosahedron edges are created once per edge
+    and looked up through an edge hash index, so no coordinate search is needed.
+
+    Args:
+        frequency (int): Number of segments per icosahedron edge (1 returns the icosahedron).
+
+    Returns:
+        GeodesicMesh: Unit vertices, sorted edge pairs and triangle faces.
+
+    Raises:
+        ValueError: If frequency is not a positive integer.
+    """
+    if not isinstance(frequency, (int, np.integer)) or frequency < 1:
+        raise ValueError("Frequency must be a positive integer.")
+    n = int(frequency)
+    base_vertices, base_edges, base_faces = _icosahedron()
+    num_base = len(base_vertices)
+    edge_slot = {(int(a), int(b)): e for e, (a, b) in enumerate(base_edges)}
+
+    # Points inside each icosahedron edge, k / n of the way from its lower to its higher vertex
+    t = np.arange(1, n) / n
+    start = base_vertices[base_edges[:, 0]]
+    end = base_vertices[base_edges[:, 1]]
+    edge_points = start[:, np.newaxis, :] + (end - start)[:, np.newaxis, :] * t[np.newaxis, :, np.newaxis]
+    edge_offset = num_base
+
+    # Barycentric lattice (i, j) with i + j <= n over each face A, B, C
+    i_idx, j_idx = np.nonzero(np.add.outer(np.arange(n + 1), np.arange(n + 1)) <= n)
+    interior = (i_idx >= 1) & (j_idx >= 1) & (i_idx + j_idx <= n - 1)
+    num_interior = int(interior.sum())
+    interior_offset = edge_offset + len(base_edges) * (n - 1)
+
+    a = base_vertices[base_faces[:, 0]]
+    b = base_vertices[base_faces[:, 1]]
+    c = base_vertices[base_faces[:, 2]]
+    ii = (i_idx[interior] / n)[np.newaxis, :, np.newaxis]
+    jj = (j_idx[interior] / n)[np.newaxis, :, np.newaxis]
+    interior_points = a[:, np.newaxis, :] + (b - a)[:, np.newaxis, :] * ii + (c - a)[:, np.newaxis, :] * jj
+
+    vertices = np.concatenate((base_vertices, edge_points.reshape(-1, 3), interior_points.reshape(-1, 3)))
+    vertices /= np.linalg.norm(vertices, axis=1)[:, np.newaxis]
+
+    def edge_point_indices(p: int, q: int, k: np.ndarray) -> np.ndarray:
+        # Global index of the point k / n of the way from p to q on a base edge
+        if p < q:
+            return edge_offset + edge_slot[(p, q)] * (n - 1) + (k - 1)
+        return edge_offset + edge_slot[(q, p)] * (n - 1) + (n - k - 1)
+
+    lattice = np.full((len(base_faces), n + 1, n + 1), -1, dtype=np.int64)
+    on_ab = (j_idx == 0) & (i_idx > 0) & (i_idx < n)
+    on_ac = (i_idx == 0) & (j_idx > 0) & (j_idx < n)
+    on_bc = (i_idx + j_idx == n) & (i_idx > 0) & (i_idx < n)
+    for f, (fa, fb, fc) in enumerate(base_faces.tolist()):
+        face = lattice[f]
+        face[0, 0], face[n, 0], face[0, n] = fa, fb, fc
+        face[i_idx[on_ab], 0] = edge_point_indices(fa, fb, i_idx[on_ab])
+        face[0, j_idx[on_ac]] = edge_point_indices(fa, fc, j_idx[on_ac])
+        face[i_idx[on_bc], j_idx[on_bc]] = edge_point_indices(fb, fc, j_idx[on_bc])
+        face[i_idx[interior], j_idx[interior]] = interior_offset + f * num_interior + np.arange(num_interior)
+
+    # Upward triangles (i, j), (i+1, j), (i, j+1) and downward (i+1, j), (i+1, j+1), (i, j+1)
+    up = i_idx + j_idx <= n - 1
+    down = i_idx + j_idx <= n - 2
+    ui, uj = i_idx[up], j_idx[up]
+    di, dj = i_idx[down], j_idx[down]
+    faces = np.concatenate((
+        np.stack((lattice[:, ui, uj], lattice[:, ui + 1, uj], lattice[:, ui, uj + 1]), axis=2).reshape(-1, 3),
+        np.stack((lattice[:, di + 1, dj], lattice[:, di + 1, dj + 1], lattice[:, di, dj + 1]), axis=2).reshape(-1, 3)
+    ))
+
+    triangle_edges = np.concatenate((faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]))
+    edges, _ = _edge_index(triangle_edges, len(vertices))
+    return GeodesicMesh(vertices, edges, faces)
+
+def goldberg_mesh(frequency: int) -> GeodesicMesh:
+    """
+    Build the Goldberg polyhedron dual to a frequency-N geodesic icosphere.
+
+    Vertices are the normalised centroids of the geodesic triangles (20 * N**2 of them)
+    and two vertices are joined when their triangles share an edge.
+
+    Args:
+        frequency (int): Subdivision frequency of the underlying geodesic icosphere.
+
+    Returns:
+        GeodesicMesh: Unit vertices and sorted edge pairs; faces is None.
+    """
+    primal = geodesic_mesh(frequency)
+    faces = primal.faces
+    centroids = primal.vertices[faces].sum(axis=1)
+    centroids /= np.linalg.norm(centroids, axis=1)[:, np.newaxis]
+
+    triangle_edges = np.concatenate((faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]))
+    owner = np.tile(np.arange(len(faces)), 3)
+    _, inverse = _edge_index(triangle_edges, len(primal.vertices))
+
+    # Each primal edge is shared by exactly two triangles, adjacent after sorting
+    order = np.argsort(inverse, kind='stable')
+    pairs = owner[order].reshape(-1, 2)
+    dual_edges = np.sort(pairs, axis=1)
+    dual_edges = dual_edges[np.lexsort((dual_edges[:, 1], dual_edges[:, 0]))]
+    return GeodesicMesh(centroids, dual_edges, None)
+
+def build_mesh(variant: str, frequency: int) -> GeodesicMesh:
+    """
+    Build a geodesic mesh of the requested variant.
+
+    Args:
+        variant (str): 'geodesic' for the icosphere or 'goldberg' for its dual.
+        frequency (int): Subdivision frequency.
+
+    Returns:
+        GeodesicMesh: The generated mesh.
+
+    Raises:
+        ValueError: If the variant is unsupported.
+    """
+    if variant == 'geodesic':
+        return geodesic_mesh(frequency)
+    if variant == 'goldberg':
+        return goldberg_mesh(frequency)
+    raise ValueError(f"Unsupported geodesic variant '{variant}'. Supported variants are {GEODESIC_VARIANTS}.")
+
+def expected_vertex_count(variant: str, frequency: int) -> int:
+    """
+    Number of vertices of a geodesic mesh.
+
+    Args:
+        variant (str): 'geodesic' or 'goldberg'.
+        frequency (int): Subdivision frequency.
+
+    Returns:
+        int: Vertex count (10 * N**2 + 2 for geodesic, 20 * N**2 for goldberg).
+    """
+    if variant == 'goldberg':
+        return 20 * frequency ** 2
+    return 10 * frequency ** 2 + 2
+
+def mesh_coordinates(vertices: np.ndarray) -> tuple:
+    """
+    Convert unit vertices to latitude and longitude in degrees in one batched pass.
+
+    Args:
+        vertices (numpy.ndarray): Array of shape (n, 3) on the unit sphere.
+
+    Returns:
+        tuple: (latitudes, longitudes) arrays in degrees.
+    """
+    lat = np.degrees(np.arcsin(np.clip(vertices[:, 2], -1.0, 1.0)))
+    lon = np.degrees(np.arctan2(vertices[:, 1], vertices[:, 0]))
+    return lat, lon
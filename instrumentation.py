@@ -0,0 +1,87 @@
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+
+# Spans recorded by generate_nodes_and_ley_lines, in pipeline order
+GENERATION_SPANS = ('node_generation', 'distance_statistics', 'connection', 'adjacency_wiring')
+GENERATION_COUNTERS = ('pairs_evaluated', 'pairs_pruned', 'edges_emitted')
+
+class Instrumentation:
+    """
+    Span timers and counters for one generation run.
+
+    Spans accumulate wall-clock seconds per name; counters accumulate integers. An
+    optional callback receives every event as ``callback(kind, name, value)`` with
+    kind 'span' (value in seconds) or 'counter' (the increment). With profile=True
+    the whole run is also captured with cProfile and summarised in the report.
+    """
+
+    def __init__(self, callback=None, profile: bool = False, profile_limit: int = 25):
+        """
+        Args:
+            callback (callable): Optional hook called for every span and counter event.
+            profile (bool): Capture a cProfile profile between start() and stop().
+            profile_limit (int): Number of functions listed in the profile summary.
+        """
+        self.callback = callback
+        self.spans = {}
+        self.counters = {}
+        self.profile_limit = profile_limit
+        self.profiler = cProfile.Profile() if profile else None
+        self.profile_summary = None
+        self._started = None
+        self.total_seconds = 0.0
+
+    def start(self):
+        """Start the overall clock (and the profiler, if enabled)."""
+        self._started = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        """Stop the overall clock and summarise the profile, if enabled."""
+        if self.profiler is not None:
+            self.profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self.profiler, stream=stream).sort_stats('cumulative').print_stats(self.profile_limit)
+            self.profile_summary = stream.getvalue()
+        if self._started is not None:
+            self.total_seconds += time.perf_counter() - self._started
+            self._started = None
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block and add the elapsed seconds to span ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+            if self.callback is not None:
+                self.callback('span', name, elapsed)
+
+    def count(self, name: str, value: int = 1):
+        """Add ``value`` to counter ``name``."""
+        self.counters[name] = self.counters.get(name, 0) + int(value)
+        if self.callback is not None:
+            self.callback('counter', name, int(value))
+
+    def report(self) -> dict:
+        """
+        Summary suitable for metadata['timings'].
+
+        Returns:
+            dict: 'spans' (seconds per span), 'counters', 'total_seconds' and, when
+                  profiling, 'profile' (text summary of the slowest functions).
+        """
+        report = {
+            'spans': dict(self.spans),
+            'counters': dict(self.counters),
+            'total_seconds': self.total_seconds
+        }
+        if self.profile_summary is not None:
+            report['profile'] = self.profile_summary
+        return report
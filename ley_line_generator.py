@@ -1,18 +1,44 @@
 import math
-import json
 import logging
 import numpy as np
 import os
 
-import statistics
+from distance_engine import (
+    node_coordinate_arrays, find_pairs_in_range, find_pairs_in_range_parallel, haversine_distances,
+    PairwiseDistances, distance_cache, get_pairwise_distances, MAX_CACHED_PAIRS,
+    histogram_distance_statistics, sampled_distance_statistics, iter_distance_blocks, rejected_distance_histogram
+)
+from spatial_index import SphereGrid
+from geodesic import GEODESIC_VARIANTS, build_mesh, expected_vertex_count, mesh_coordinates
+from network_arrays import NetworkArrays, build_csr_adjacency
+from network_io import infer_compression, open_text, iter_json_chunks
+from platonic import get_platonic_table
+from instrumentation import Instrumentation
 
-def validate_platonic_solid_nodes(nodes: list, solid_type: str) -> tuple:
+logger = logging.getLogger(__name__)
+
+# Bump whenever generation output changes so cached results are invalidated
+GENERATOR_VERSION = '5'
+
+# Pair evaluation strategies supported by connect_nodes
+CONNECTION_METHODS = ('auto', 'scalar', 'vectorized', 'indexed', 'parallel')
+
+# 'auto' switches to the spatial index once the network is at least this large
+# and max_distance covers at most this fraction of the half circumference
+INDEXED_MIN_NODES = 512
+INDEXED_MAX_DISTANCE_FRACTION = 0.25
+
+# Distance statistics strategies supported by suggest_distance_parameters
+SUGGESTION_MODES = ('auto', 'exact', 'histogram', 'sample')
+
+def validate_platonic_solid_nodes(nodes: list, solid_type: str, frequency: int = 1) -> tuple:
     """
     Verify node positions match expected geometry for the given platonic solid.
     
     Args:
         nodes (list): List of node dictionaries.
-        solid_type (str): Type of Platonic solid.
+        solid_type (str): Type of Platonic solid, or 'geodesic'/'goldberg' for subdivided meshes.
+        frequency (int): Subdivision frequency of geodesic meshes. Ignored for Platonic solids.
         
     Returns:
         tuple: (bool, str) - (is_valid, message)
@@ -24,6 +50,8 @@ def validate_platonic_solid_nodes(nodes: list, solid_type: str) -> tuple:
         'dodecahedron': 12,
         'icosahedron': 12
     }
+    for variant in GEODESIC_VARIANTS:
+        expected_counts[variant] = expected_vertex_count(variant, frequency)
     
     if len(nodes) != expected_counts[solid_type]:
         return False, f"Invalid number of nodes. Expected {expected_counts[solid_type]}, got {len(nodes)}."
@@ -37,7 +65,8 @@ def validate_platonic_solid_nodes(nodes: list, solid_type: str) -> tuple:
             
     return True, "Node positions are valid."
 
-def validate_ley_line_connections(nodes: list, ley_lines: list, max_distance: float) -> tuple:
+def validate_ley_line_connections(nodes: list, ley_lines: list, max_distance: float,
+                                  radius: float = 6371, distances: PairwiseDistances = None) -> tuple:
     """
     Verify all connections are within the specified maximum distance.
     
@@ -45,30 +74,28 @@ def validate_ley_line_connections(nodes: list, ley_lines: list, max_distance: fl
         nodes (list): List of node dictionaries.
         ley_lines (list): List of ley line dictionaries.
         max_distance (float): Maximum allowed distance between connected nodes.
+        radius (float): Radius of the sphere in kilometers used to measure the lines.
+        distances (PairwiseDistances): Shared pairwise distances for these nodes. When omitted,
+                                       a cached result is reused if one exists; otherwise only
+                                       the ley lines themselves are measured.
         
     Returns:
         tuple: (bool, str) - (is_valid, message)
     """
-    node_dict = {node['id']: node for node in nodes}
-    invalid_connections = []
+    node_index = {node['id']: i for i, node in enumerate(nodes)}
+    rows = np.fromiter((node_index[line['nodes'][0]] for line in ley_lines), dtype=np.int64, count=len(ley_lines))
+    cols = np.fromiter((node_index[line['nodes'][1]] for line in ley_lines), dtype=np.int64, count=len(ley_lines))
     
-    for line in ley_lines:
-        node1 = node_dict[line['nodes'][0]]
-        node2 = node_dict[line['nodes'][1]]
-        
-        lat1 = math.radians(node1['coordinates']['latitude'])
-        lon1 = math.radians(node1['coordinates']['longitude'])
-        lat2 = math.radians(node2['coordinates']['latitude'])
-        lon2 = math.radians(node2['coordinates']['longitude'])
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        distance = 6371 * c  # Using Earth's radius
-        
-        if distance > max_distance:
-            invalid_connections.append((line['id'], distance))
+    lat, lon = node_coordinate_arrays(nodes)
+    if distances is None:
+        distances = distance_cache.peek(lat, lon)
+    if distances is not None:
+        line_distances = distances.distances_between(rows, cols, radius)
+    else:
+        line_distances = haversine_distances(lat[rows], lon[rows], lat[cols], lon[cols], radius)
+    
+    invalid = np.nonzero(line_distances > max_distance)[0]
+    invalid_connections = [(ley_lines[k]['id'], float(line_distances[k])) for k in invalid.tolist()]
     
     if invalid_connections:
         details = '\n'.join([f"Line {line_id}: {dist:.2f} km" for line_id, dist in invalid_connections])
@@ -76,46 +103,80 @@ def validate_ley_line_connections(nodes: list, ley_lines: list, max_distance: fl
         
     return True, f"All {len(ley_lines)} connections are within maximum distance."
 
-def suggest_distance_parameters(nodes: list) -> dict:
+def suggest_distance_parameters(nodes: list, spatial_index: SphereGrid = None,
+                                distances: PairwiseDistances = None, mode: str = 'auto',
+                                error_bound: float = None, radius: float = 6371) -> dict:
     """
     Calculate and suggest optimal distance parameters based on node distribution.
     
     Args:
         nodes (list): List of node dictionaries.
+        spatial_index (SphereGrid): Optional index over the nodes. When given, the minimum
+                                    distance is taken from exact nearest-neighbour queries and
+                                    nearest-neighbour statistics are added to the result.
+        distances (PairwiseDistances): Shared pairwise distances for these nodes. Taken from
+                                       the process-wide distance cache when omitted.
+        mode (str): 'exact' materialises all pair distances (shared via the distance cache),
+                    'histogram' streams them through a fixed-width histogram without storing
+                    them, 'sample' estimates the median from random pairs in time independent
+                    of n^2, and 'auto' uses 'exact' unless the pair count exceeds what the
+                    distance cache may hold, then 'sample'.
+        error_bound (float): Accuracy of the approximate modes. For 'histogram' the largest
+                             absolute median error in km (default 1.0); for 'sample' the
+                             tolerated rank error as a fraction of all pairs (default 0.01).
+        radius (float): Radius of the sphere in kilometers.
         
     Returns:
-        dict: Suggested parameters including min_distance and max_distance
+        dict: Suggested parameters including min_distance and max_distance. Approximate
+              modes add an 'error_estimate' entry describing the accuracy of the median.
+
+    Raises:
+        ValueError: If the mode is unknown.
     """
-    all_distances = []
-    for i, node1 in enumerate(nodes):
-        lat1 = math.radians(node1['coordinates']['latitude'])
-        lon1 = math.radians(node1['coordinates']['longitude'])
-        
-        for node2 in nodes[i+1:]:
-            lat2 = math.radians(node2['coordinates']['latitude'])
-            lon2 = math.radians(node2['coordinates']['longitude'])
-            
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-            distance = 6371 * c
-            all_distances.append(distance)
+    if mode not in SUGGESTION_MODES:
+        raise ValueError(f"Unsupported mode '{mode}'. Supported modes are {SUGGESTION_MODES}.")
+    lat, lon = node_coordinate_arrays(nodes)
+    num_pairs = len(nodes) * (len(nodes) - 1) // 2
+    if mode == 'auto':
+        mode = 'exact' if distances is not None or num_pairs <= MAX_CACHED_PAIRS else 'sample'
     
-    if not all_distances:
+    if num_pairs == 0:
         return {
             'min_distance': 0,
-            'max_distance': 6371 * math.pi,  # Half circumference
+            'max_distance': radius * math.pi,  # Half circumference
             'message': "No node pairs found for distance calculation"
         }
     
-    min_dist = min(all_distances)
-    median_dist = statistics.median(all_distances)
+    error_estimate = None
+    if mode == 'exact':
+        if distances is None:
+            distances = get_pairwise_distances(lat, lon)
+        median_dist, min_dist = distances.median_and_min(radius)
+    elif mode == 'histogram':
+        stats = histogram_distance_statistics(lat, lon, radius, error_bound if error_bound is not None else 1.0)
+        median_dist = stats['median_distance']
+        min_dist = stats['min_distance']
+        error_estimate = {'mode': 'histogram', 'median_abs_error': stats['median_error']}
+    else:
+        stats = sampled_distance_statistics(lat, lon, radius, error_bound if error_bound is not None else 0.01)
+        median_dist = stats['median_distance']
+        if spatial_index is None:
+            spatial_index = SphereGrid.for_nearest_neighbors(lat, lon)
+        error_estimate = {
+            'mode': 'sample',
+            'sample_size': stats['sample_size'],
+            'median_rank_error': error_bound if error_bound is not None else 0.01,
+            'confidence': 0.99,
+            'median_interval': stats['median_interval']
+        }
+    if spatial_index is not None:
+        nearest = spatial_index.nearest_neighbor_distances(radius)
+        min_dist = float(nearest.min())
     
     suggested_max = median_dist * 1.5
     suggested_min = min_dist * 0.8
     
-    return {
+    suggestions = {
         'min_distance': suggested_min,
         'max_distance': suggested_max,
         'median_distance': median_dist,
@@ -124,8 +185,15 @@ def suggest_distance_parameters(nodes: list) -> dict:
                   f"Maximum distance: {suggested_max:.2f} km\n"
                   f"Median distance: {median_dist:.2f} km"
     }
-# Configure logging with a default level and allow external configuration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if error_estimate is not None:
+        suggestions['error_estimate'] = error_estimate
+    if spatial_index is not None:
+        suggestions['nearest_neighbor_distance'] = {
+            'min': min_dist,
+            'mean': float(nearest.mean()),
+            'max': float(nearest.max())
+        }
+    return suggestions
 
 def generate_platonic_solid(solid_type: str = 'icosahedron', radius: float = 6371) -> list:
     """
@@ -142,90 +210,129 @@ def generate_platonic_solid(solid_type: str = 'icosahedron', radius: float = 637
     Raises:
         ValueError: If an unsupported solid_type is provided or radius is non-positive.
     """
-    logging.info(f"Generating nodes for a {solid_type} mapped onto a sphere with radius {radius} km.")
+    logger.info("Generating nodes for a %s mapped onto a sphere with radius %s km.", solid_type, radius)
 
     # Validate inputs
     if radius <= 0:
         raise ValueError("Radius must be a positive number.")
 
-    # Define the vertices for each Platonic solid
-    if solid_type == 'tetrahedron':
-        # Tetrahedron vertices
-        points = np.array([
-            [1, 1, 1],
-            [-1, -1, 1],
-            [-1, 1, -1],
-            [1, -1, -1]
-        ])
-    elif solid_type == 'cube':
-        # Cube vertices
-        points = np.array([
-            [1, 1, 1],
-            [1, 1, -1],
-            [1, -1, 1],
-            [1, -1, -1],
-            [-1, 1, 1],
-            [-1, 1, -1],
-            [-1, -1, 1],
-            [-1, -1, -1]
-        ])
-    elif solid_type == 'octahedron':
-        # Octahedron vertices
-        points = np.array([
-            [1, 0, 0],
-            [-1, 0, 0],
-            [0, 1, 0],
-            [0, -1, 0],
-            [0, 0, 1],
-            [0, 0, -1]
-        ])
-    elif solid_type == 'dodecahedron':
-        # Dodecahedron vertices
-        phi = (1 + np.sqrt(5)) / 2  # Golden ratio
-        points = []
-        for i in [-1, 1]:
-            for j in [-1, 1]:
-                points.extend([
-                    [0, i/phi, j*phi],
-                    [i/phi, j*phi, 0],
-                    [i*phi, 0, j/phi]
-                ])
-        points = np.array(points)
-    elif solid_type == 'icosahedron':
-        # Icosahedron vertices
-        phi = (1 + np.sqrt(5)) / 2  # Golden ratio
-        points = []
-        for i in [-1, 1]:
-            for j in [-1, 1]:
-                points.append([0, i, j * phi])
-                points.append([i, j * phi, 0])
-                points.append([i * phi, 0, j])
-        points = np.array(points)
-    else:
-        raise ValueError(f"Unsupported solid_type '{solid_type}'. Supported types are 'tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron'.")
-
-    # Normalize and scale points to the sphere
-    norms = np.linalg.norm(points, axis=1)
-    points = points / norms[:, np.newaxis]  # Normalize vectors
-    points *= radius  # Scale to the sphere radius
-
-    # Convert to spherical coordinates
-    nodes = []
-    for idx, (x, y, z) in enumerate(points):
-        latitude = math.degrees(math.asin(z / radius))
-        longitude = math.degrees(math.atan2(y, x))
-        node = {
+    # Unit-sphere positions are precomputed once per solid; latitude and longitude
+    # do not depend on the radius, so no per-call trigonometry is needed
+    table = get_platonic_table(solid_type)
+    nodes = [
+        {
             "id": f"node_{idx:03}",
             "coordinates": {"latitude": latitude, "longitude": longitude},
             "category": "major_node",
             "associated_ley_lines": [],
             "nearby_nodes": []
         }
-        nodes.append(node)
-    logging.info(f"Generated {len(nodes)} nodes for solid {solid_type}.")
+        for idx, (latitude, longitude) in enumerate(zip(table.latitudes.tolist(), table.longitudes.tolist()))
+    ]
+    logger.info("Generated %d nodes for solid %s.", len(nodes), solid_type)
     return nodes
 
-def connect_nodes(nodes: list, radius: float, max_distance: float, auto_adjust: bool = False) -> tuple:
+def _mesh_edge_lengths(lat, lon, mesh_edges, radius: float):
+    """Great-circle length of every mesh edge, from coordinates in radians."""
+    rows, cols = mesh_edges[:, 0], mesh_edges[:, 1]
+    return haversine_distances(lat[rows], lon[rows], lat[cols], lon[cols], radius)
+
+def _suggest_from_edge_lengths(lengths, radius: float) -> dict:
+    """Distance suggestions that bracket the given mesh edge lengths."""
+    if len(lengths) == 0:
+        return {
+            'min_distance': 0,
+            'max_distance': radius * math.pi,
+            'message': "No mesh edges found for distance calculation"
+        }
+    median_dist = float(np.median(lengths))
+    suggested_min = float(lengths.min()) * 0.8
+    suggested_max = float(lengths.max()) * 1.5
+    return {
+        'min_distance': suggested_min,
+        'max_distance': suggested_max,
+        'median_distance': median_dist,
+        'message': f"Suggested parameters based on mesh edge lengths:\n"
+                  f"Minimum distance: {suggested_min:.2f} km\n"
+                  f"Maximum distance: {suggested_max:.2f} km\n"
+                  f"Median distance: {median_dist:.2f} km"
+    }
+
+def _select_mesh_edges(mesh_edges, lengths, max_distance: float, suggestions: dict) -> tuple:
+    """
+    Keep mesh edges no longer than max_distance and build the connection metadata.
+
+    Only mesh edges are candidates, so connection_stats['attempted'] counts mesh edges
+    rather than all node pairs as in connect_nodes; 'mesh_edges' records the same
+    figure under an explicit name.
+    """
+    logger.info("Connecting %d mesh edges within %s km to create ley lines.", len(mesh_edges), max_distance)
+    kept_edges = mesh_edges[lengths <= max_distance]
+    if len(kept_edges) == 0:
+        logger.warning("No ley lines were generated. This might indicate that the distance parameters need adjustment.")
+    else:
+        logger.info("Generated %d ley lines.", len(kept_edges))
+    metadata = {
+        'original_max_distance': max_distance,
+        'suggested_parameters': suggestions,
+        'adjustments_made': [],
+        'connection_stats': {'attempted': len(mesh_edges), 'successful': len(kept_edges),
+                             'mesh_edges': len(mesh_edges)}
+    }
+    return kept_edges, metadata
+
+def _wire_ley_lines(nodes: list, pair_rows, pair_cols) -> list:
+    """
+    Create ley line dictionaries for the given node index pairs and link them to their nodes.
+
+    Node adjacency is built once as CSR (degree count, prefix sum, fill) and each node's
+    ``associated_ley_lines`` and ``nearby_nodes`` lists are extended in a single pass, with
+    a set guarding ``nearby_nodes`` against duplicates, so wiring is linear in the number
+    of ley lines however dense the network is.
+
+    Args:
+        nodes (list): List of node dictionaries.
+        pair_rows: Index of the first node of each pair.
+        pair_cols: Index of the second node of each pair.
+
+    Returns:
+        list: List of ley line dictionaries numbered in pair order.
+    """
+    rows = np.asarray(pair_rows, dtype=np.int64)
+    cols = np.asarray(pair_cols, dtype=np.int64)
+    node_ids = [node['id'] for node in nodes]
+    major = [node['category'] == "major_node" for node in nodes]
+    line_ids = [f"leyline_{ley_line_id:03}" for ley_line_id in range(len(rows))]
+    ley_lines = [{
+        "id": line_id,
+        "nodes": [node_ids[i], node_ids[j]],
+        "category": "primary" if major[i] and major[j] else "secondary"
+    } for line_id, i, j in zip(line_ids, rows.tolist(), cols.tolist())]
+    if not ley_lines:
+        return ley_lines
+
+    indptr, indices, edge_ids = build_csr_adjacency(len(nodes), np.column_stack((rows, cols)))
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    edge_ids = edge_ids.tolist()
+    for k, node in enumerate(nodes):
+        start, stop = indptr[k], indptr[k + 1]
+        if start == stop:
+            continue
+        node['associated_ley_lines'].extend([line_ids[e] for e in edge_ids[start:stop]])
+        nearby = node['nearby_nodes']
+        known = set(nearby)
+        for j in indices[start:stop]:
+            other = node_ids[j]
+            if other not in known:
+                known.add(other)
+                nearby.append(other)
+    return ley_lines
+
+def connect_nodes(nodes: list, radius: float, max_distance: float, auto_adjust: bool = False,
+                  method: str = 'auto', suggestions: dict = None,
+                  distances: PairwiseDistances = None, workers: int = None,
+                  instrumentation: Instrumentation = None, rejection_histogram: bool = False) -> tuple:
     """
     Connect nodes within a certain distance to create ley lines.
 
@@ -234,18 +341,48 @@ def connect_nodes(nodes: list, radius: float, max_distance: float, auto_adjust:
         radius (float): Radius of the sphere in kilometers.
         max_distance (float): Maximum distance between nodes to create a ley line.
         auto_adjust (bool): Whether to automatically adjust distance parameters if no connections are made.
+        method (str): Pair evaluation strategy. 'vectorized' uses the blocked NumPy distance
+                      engine, 'indexed' only tests candidate pairs from a spatial grid sized to
+                      max_distance, 'parallel' shards the all-pairs search across a process
+                      pool, 'scalar' uses the reference pure-Python loop and 'auto'
+                      picks 'indexed' for large, short-range networks and 'vectorized'
+                      otherwise. All methods produce the same ley line ids and node wiring.
+                      'auto' and 'vectorized' select pairs from shared pairwise distances
+                      instead of recomputing them when those are available.
+        suggestions (dict): Result of suggest_distance_parameters for these nodes, if already known.
+        distances (PairwiseDistances): Shared pairwise distances for these nodes. When omitted,
+                                       the process-wide distance cache is consulted.
+        workers (int): Number of worker processes for the 'parallel' method (default: all cores).
+        instrumentation (Instrumentation): Receives the 'distance_statistics', 'connection' and
+                                           'adjacency_wiring' spans and the pair/edge counters.
+        rejection_histogram (bool): Also histogram the distances of pairs rejected for being
+                                    above max_distance or below min_distance, in
+                                    metadata['rejected_distances']. Costs one extra pass over
+                                    the pair distances, outside the connection loop.
 
     Returns:
         tuple: (list, dict) - (ley_lines, metadata) where metadata includes suggestions and adjustments,
                connection statistics, and parameter adjustments
 
     Raises:
-        ValueError: If distance parameters are invalid.
+        ValueError: If distance parameters are invalid or the method is unknown.
     """
-    logging.info(f"Connecting nodes within {max_distance} km to create ley lines.")
+    if method not in CONNECTION_METHODS:
+        raise ValueError(f"Unsupported method '{method}'. Supported methods are {CONNECTION_METHODS}.")
+    logger.info("Connecting nodes within %s km to create ley lines.", max_distance)
+    
+    if instrumentation is None:
+        instrumentation = Instrumentation()
     
-    # Get suggested parameters
-    suggestions = suggest_distance_parameters(nodes)
+    # Get suggested parameters, sharing one distance pass with the connection step
+    lat, lon = node_coordinate_arrays(nodes)
+    with instrumentation.span('distance_statistics'):
+        if distances is None:
+            distances = distance_cache.peek(lat, lon)
+        if distances is None and suggestions is None and len(nodes) * (len(nodes) - 1) // 2 <= MAX_CACHED_PAIRS:
+            distances = get_pairwise_distances(lat, lon)
+        if suggestions is None:
+            suggestions = suggest_distance_parameters(nodes, distances=distances, radius=radius)
     
     # Initialize metadata
     metadata = {
@@ -268,93 +405,132 @@ def connect_nodes(nodes: list, radius: float, max_distance: float, auto_adjust:
             f"Adjusted max_distance to sphere limit: {max_distance:.2f} km"
         )
 
-    # Initialize connection tracking
-    ley_lines = []
-    ley_line_id = 0
     num_nodes = len(nodes)
-    connections_made = False
-    for i in range(num_nodes):
-        node_a = nodes[i]
-        for j in range(i + 1, num_nodes):
-            node_b = nodes[j]
-
-            try:
-                # Calculate distance between nodes using the haversine formula
-                lat1 = math.radians(node_a['coordinates']['latitude'])
-                lon1 = math.radians(node_a['coordinates']['longitude'])
-                lat2 = math.radians(node_b['coordinates']['latitude'])
-                lon2 = math.radians(node_b['coordinates']['longitude'])
+    if method == 'auto':
+        short_range = max_distance <= INDEXED_MAX_DISTANCE_FRACTION * max_possible_distance
+        use_index = distances is None and num_nodes >= INDEXED_MIN_NODES and short_range
+        method = 'indexed' if use_index else 'vectorized'
+    total_pairs = num_nodes * (num_nodes - 1) // 2
+    search_stats = {'candidates': total_pairs}
+    if method in ('vectorized', 'indexed', 'parallel'):
+        with instrumentation.span('connection'):
+            if method == 'parallel':
+                pair_rows, pair_cols, _ = find_pairs_in_range_parallel(lat, lon, radius, min_distance, max_distance, workers)
+            elif method == 'vectorized' and distances is not None:
+                pair_rows, pair_cols, _ = distances.pairs_in_range(radius, min_distance, max_distance, search_stats)
+            elif method == 'indexed':
+                grid = SphereGrid.for_distance(lat, lon, radius, max_distance)
+                pair_rows, pair_cols, _ = grid.query_pairs(radius, min_distance, max_distance, search_stats)
+            else:
+                pair_rows, pair_cols, _ = find_pairs_in_range(lat, lon, radius, min_distance, max_distance)
+        with instrumentation.span('adjacency_wiring'):
+            ley_lines = _wire_ley_lines(nodes, pair_rows, pair_cols)
+        connections_made = bool(ley_lines)
+    else:
+        pair_rows, pair_cols = [], []
+        with instrumentation.span('connection'):
+            for i in range(num_nodes):
+                node_a = nodes[i]
+                for j in range(i + 1, num_nodes):
+                    node_b = nodes[j]
+
+                    try:
+                        # Calculate distance between nodes using the haversine formula
+                        lat1 = math.radians(node_a['coordinates']['latitude'])
+                        lon1 = math.radians(node_a['coordinates']['longitude'])
+                        lat2 = math.radians(node_b['coordinates']['latitude'])
+                        lon2 = math.radians(node_b['coordinates']['longitude'])
                 
-                # Use stable formula for small angles
-                dlat = lat2 - lat1
-                dlon = lon2 - lon1
+                        # Use stable formula for small angles
+                        dlat = lat2 - lat1
+                        dlon = lon2 - lon1
                 
-                # Use double-precision arithmetic for better accuracy
-                sin_dlat = math.sin(dlat/2)
-                sin_dlon = math.sin(dlon/2)
-                cos_lat1 = math.cos(lat1)
-                cos_lat2 = math.cos(lat2)
+                        # Use double-precision arithmetic for better accuracy
+                        sin_dlat = math.sin(dlat/2)
+                        sin_dlon = math.sin(dlon/2)
+                        cos_lat1 = math.cos(lat1)
+                        cos_lat2 = math.cos(lat2)
                 
-                # Calculate haversine formula components with validation
-                a = sin_dlat**2 + cos_lat1 * cos_lat2 * sin_dlon**2
+                        # Calculate haversine formula components with validation
+                        a = sin_dlat**2 + cos_lat1 * cos_lat2 * sin_dlon**2
                 
-                # Handle numerical precision
-                a = max(0.0, min(1.0, a))  # Clamp to [0, 1]
+                        # Handle numerical precision
+                        a = max(0.0, min(1.0, a))  # Clamp to [0, 1]
                 
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-                distance = radius * c
+                        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+                        distance = radius * c
                 
-                # Log distances when debugging
-                if distance > max_distance:
-                    logging.debug(f"Distance between {node_a['id']} and {node_b['id']}: {distance:.2f} km (exceeds max_distance)")
-                elif distance < min_distance:
-                    logging.debug(f"Distance between {node_a['id']} and {node_b['id']}: {distance:.2f} km (below min_distance)")
-
-            except (ValueError, ZeroDivisionError) as e:
-                logging.warning(f"Error calculating distance between nodes {node_a['id']} and {node_b['id']}: {str(e)}")
-                continue
-
-            # Add connection if within valid range
-            if min_distance <= distance <= max_distance:
-                connections_made = True
-                ley_line = {
-                    "id": f"leyline_{ley_line_id:03}",
-                    "nodes": [node_a['id'], node_b['id']],
-                    "category": "primary" if node_a['category'] == "major_node" and node_b['category'] == "major_node" else "secondary"
-                }
-                ley_lines.append(ley_line)
-                ley_line_id += 1
-                node_a['associated_ley_lines'].append(ley_line['id'])
-                node_b['associated_ley_lines'].append(ley_line['id'])
-                if node_b['id'] not in node_a['nearby_nodes']:
-                    node_a['nearby_nodes'].append(node_b['id'])
-                if node_a['id'] not in node_b['nearby_nodes']:
-                    node_b['nearby_nodes'].append(node_a['id'])
+                    except (ValueError, ZeroDivisionError) as e:
+                        logger.warning("Error calculating distance between nodes %s and %s: %s", node_a['id'], node_b['id'], e)
+                        continue
+
+                    # Add connection if within valid range
+                    if min_distance <= distance <= max_distance:
+                        pair_rows.append(i)
+                        pair_cols.append(j)
+        with instrumentation.span('adjacency_wiring'):
+            ley_lines = _wire_ley_lines(nodes, np.array(pair_rows, dtype=np.int64), np.array(pair_cols, dtype=np.int64))
+        connections_made = bool(ley_lines)
     if not connections_made:
-        logging.warning("No ley lines were generated. This might indicate that the distance parameters need adjustment.")
+        logger.warning("No ley lines were generated. This might indicate that the distance parameters need adjustment.")
     else:
-        logging.info(f"Generated {len(ley_lines)} ley lines.")
-    metadata['connection_stats']['attempted'] = num_nodes * (num_nodes - 1) // 2
+        logger.info("Generated %d ley lines.", len(ley_lines))
+    metadata['connection_stats']['attempted'] = total_pairs
     metadata['connection_stats']['successful'] = len(ley_lines)
+    if rejection_histogram:
+        with instrumentation.span('distance_statistics'):
+            if distances is not None:
+                blocks = [distances.distances(radius)]
+            else:
+                blocks = (block for _, _, block in iter_distance_blocks(lat, lon, radius))
+            metadata['rejected_distances'] = rejected_distance_histogram(blocks, radius, min_distance, max_distance)
+    instrumentation.count('pairs_evaluated', search_stats['candidates'])
+    instrumentation.count('pairs_pruned', total_pairs - search_stats['candidates'])
+    instrumentation.count('edges_emitted', len(ley_lines))
     return ley_lines, metadata
 
 def generate_nodes_and_ley_lines(
     solid_type: str = 'icosahedron',
     radius: float = 6371,
     max_distance: float = 5000,
-    auto_adjust: bool = False
+    auto_adjust: bool = False,
+    method: str = 'auto',
+    frequency: int = 1,
+    as_arrays: bool = False,
+    workers: int = None,
+    instrumentation: Instrumentation = None,
+    rejection_histogram: bool = False
 ) -> dict:
     """
     Generate nodes and ley lines based on a Platonic solid mapping.
 
     Args:
-        solid_type (str): Type of Platonic solid.
+        solid_type (str): Type of Platonic solid, or 'geodesic'/'goldberg' for a subdivided
+                          icosphere whose ley lines follow the mesh edges.
         radius (float): Radius of the sphere in kilometers.
         max_distance (float): Maximum distance between nodes to create ley lines.
         auto_adjust (bool): Whether to automatically adjust parameters for optimal connections.
+        method (str): Pair evaluation strategy passed to connect_nodes (see CONNECTION_METHODS).
+                      Geodesic solid types connect mesh edges directly and ignore it.
+        frequency (int): Subdivision frequency for geodesic solid types.
+        as_arrays (bool): Return a columnar NetworkArrays instead of the legacy dictionary.
+                          Geodesic networks are then built without creating per-node dicts;
+                          the legacy view stays available through NetworkArrays.to_legacy().
+        workers (int): Worker processes for method='parallel' (default: all cores).
+        instrumentation (Instrumentation): Collects span timings and counters; pass one with a
+                                           callback or profile=True to observe the run. A fresh
+                                           one is used when omitted. Its report is stored in
+                                           metadata['timings'].
+        rejection_histogram (bool): Record histograms of rejected pair distances in
+                                    metadata['rejected_distances'] (see connect_nodes).
 
     Returns:
-        dict: Dictionary containing nodes, ley lines, and metadata including adjustments and statistics.
+        dict: Dictionary containing nodes, ley lines, and metadata including adjustments, statistics
+              and timings (or a NetworkArrays when as_arrays is set). For geodesic solid types
+              connection_stats['attempted'] counts candidate mesh edges, not node pairs.
+
+    Raises:
+        ValueError: If inputs are invalid or the method is unknown.
     """
     """
     Generate nodes and ley lines based on a Platonic solid mapping.
@@ -372,20 +548,37 @@ def generate_nodes_and_ley_lines(
         ValueError: If inputs are invalid.
     """
     # Validate inputs
-    valid_solids = ['tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron']
+    valid_solids = ['tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron'] + list(GEODESIC_VARIANTS)
     if solid_type not in valid_solids:
         raise ValueError(f"Invalid solid_type '{solid_type}'. Must be one of {valid_solids}.")
     if radius <= 0:
         raise ValueError("Radius must be a positive number.")
     if max_distance <= 0:
         raise ValueError("Max distance must be a positive number.")
-
+    if method not in CONNECTION_METHODS:
+        raise ValueError(f"Unsupported method '{method}'. Supported methods are {CONNECTION_METHODS}.")
+    if solid_type in GEODESIC_VARIANTS and method != 'auto':
+        logger.warning("Method '%s' is ignored for %s networks; ley lines follow the mesh edges.", method, solid_type)
+
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    instrumentation.start()
     try:
-        # Generate initial nodes
-        nodes = generate_platonic_solid(solid_type, radius)
-        
-        # Get parameter suggestions
-        suggested_params = suggest_distance_parameters(nodes)
+        # Generate initial nodes and get parameter suggestions
+        if solid_type in GEODESIC_VARIANTS:
+            with instrumentation.span('node_generation'):
+                mesh = build_mesh(solid_type, frequency)
+                latitudes, longitudes = mesh_coordinates(mesh.vertices)
+            logger.info("Generated %d nodes and %d mesh edges for %s frequency %d.", len(latitudes), len(mesh.edges), solid_type, frequency)
+            with instrumentation.span('distance_statistics'):
+                lengths = _mesh_edge_lengths(np.radians(latitudes), np.radians(longitudes), mesh.edges, radius)
+                suggested_params = _suggest_from_edge_lengths(lengths, radius)
+        else:
+            with instrumentation.span('node_generation'):
+                nodes = generate_platonic_solid(solid_type, radius)
+            with instrumentation.span('distance_statistics'):
+                distances = get_pairwise_distances(*node_coordinate_arrays(nodes))
+                suggested_params = suggest_distance_parameters(nodes, distances=distances, radius=radius)
         
         # Adjust parameters if auto_adjust is enabled
         if auto_adjust:
@@ -395,7 +588,20 @@ def generate_nodes_and_ley_lines(
             min_distance = 0  # Use original behavior if auto_adjust is disabled
         
         # Connect nodes with adjusted parameters
-        ley_lines, metadata = connect_nodes(nodes, radius, max_distance, auto_adjust)
+        if solid_type in GEODESIC_VARIANTS:
+            with instrumentation.span('connection'):
+                kept_edges, metadata = _select_mesh_edges(mesh.edges, lengths, max_distance, suggested_params)
+            num_nodes = len(latitudes)
+            instrumentation.count('pairs_evaluated', len(mesh.edges))
+            instrumentation.count('pairs_pruned', num_nodes * (num_nodes - 1) // 2 - len(mesh.edges))
+            instrumentation.count('edges_emitted', len(kept_edges))
+            if rejection_histogram:
+                # Only mesh edges are candidates, and mesh selection has no lower bound
+                metadata['rejected_distances'] = rejected_distance_histogram([lengths], radius, 0.0, max_distance)
+        else:
+            ley_lines, metadata = connect_nodes(nodes, radius, max_distance, auto_adjust, method=method,
+                                                suggestions=suggested_params, distances=distances, workers=workers,
+                                                instrumentation=instrumentation, rejection_histogram=rejection_histogram)
         
         # Update metadata with parameter information
         metadata['parameter_adjustments'] = {
@@ -406,48 +612,71 @@ def generate_nodes_and_ley_lines(
             'final_max_distance': max_distance if not auto_adjust else min(max_distance, suggested_params['max_distance'])
         }
         
-        data = {
-            "nodes": nodes,
-            "ley_lines": ley_lines,
-            "metadata": metadata
-        }
-        return data
+        if solid_type in GEODESIC_VARIANTS:
+            with instrumentation.span('adjacency_wiring'):
+                network = NetworkArrays(latitudes, longitudes, kept_edges, radius, metadata=metadata)
+                result = network if as_arrays else network.to_legacy()
+        else:
+            data = {
+                "nodes": nodes,
+                "ley_lines": ley_lines,
+                "metadata": metadata
+            }
+            result = NetworkArrays.from_legacy(data, radius) if as_arrays else data
     except Exception as e:
-        logging.exception("An error occurred during node and ley line generation.")
+        logger.exception("An error occurred during node and ley line generation.")
         raise
+    finally:
+        # Always disable a running profiler, also when generation fails
+        instrumentation.stop()
+    metadata['timings'] = instrumentation.report()
+    return result
 
-def save_to_file(data: dict, output_file: str):
+def save_to_file(data: dict, output_file: str, indent: int = 4, compression: str = 'infer'):
     """
     Save data to a JSON file atomically to prevent data corruption.
 
+    The document is streamed to a temporary file record by record, so peak memory does
+    not grow with the size of the output, and then renamed over output_file.
+
     Args:
-        data (dict): Data to be saved.
+        data (dict): Data to be saved, a legacy network dictionary or NetworkArrays.
         output_file (str): Path to the output JSON file.
+        indent (int): Spaces per nesting level, or None for compact output.
+        compression (str): 'gzip', 'bz2', 'lzma', None, or 'infer' to choose from the
+                           file extension (.gz, .bz2, .xz).
 
     Raises:
         IOError: If the file cannot be written.
+        ValueError: If the compression is unsupported.
     """
+    compression = infer_compression(output_file, compression)
     temp_file = output_file + '.tmp'
     try:
-        with open(temp_file, "w") as file:
-            json.dump(data, file, indent=4)
+        with open_text(temp_file, "w", compression) as file:
+            for chunk in iter_json_chunks(data, indent):
+                file.write(chunk)
         os.replace(temp_file, output_file)
-        logging.info(f"JSON data saved to {output_file}.")
+        logger.info("JSON data saved to %s.", output_file)
     except Exception as e:
-        logging.exception(f"Failed to save JSON data to {output_file}.")
+        logger.exception("Failed to save JSON data to %s.", output_file)
         if os.path.exists(temp_file):
             os.remove(temp_file)
         raise
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     try:
-        # Generate multiple ley line configurations
+        from batch_engine import run_batch
+
+        # Generate multiple ley line configurations in parallel
         solids = ['tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron']
-        for solid in solids:
-            output_file = f"ley_lines_{solid}.json"
-            data = generate_nodes_and_ley_lines(solid_type=solid, radius=6371, max_distance=5000)
-            save_to_file(data, output_file)
-        logging.info("Ley line generation completed successfully for all solids.")
+        results = run_batch([(solid, 6371, 5000, False) for solid in solids])
+        for solid, result in zip(solids, results):
+            if 'error' in result:
+                raise ValueError(f"Generation failed for {solid}: {result['error']}")
+            save_to_file(result['data'], f"ley_lines_{solid}.json")
+        logger.info("Ley line generation completed successfully for all solids.")
     except Exception as error:
-        logging.exception("An unexpected error occurred in the main execution.")
+        logger.exception("An unexpected error occurred in the main execution.")
@@ -1,8 +1,4 @@
 import streamlit as st
-import json
-import streamlit as st
-import json
-import base64
 import numpy as np
 import pandas as pd
 import logging
@@ -20,17 +16,43 @@ logging.basicConfig(
 )
 
 # Import local modules
-from ley_line_generator import (
-    generate_nodes_and_ley_lines,
-    validate_platonic_solid_nodes,
-    validate_ley_line_connections,
-    suggest_distance_parameters
-)
-from utils import create_globe_visualization, get_preset_configurations, save_presets
+from batch_engine import run_batch
+from generation_cache import GenerationCache, cached_generate_nodes_and_ley_lines
+from network_arrays import NetworkArrays
+from network_io import export_bytes, export_batch_bytes
+from utils import create_globe_visualization, update_reference_point, get_preset_configurations, save_presets
 
 # Set up page config
 st.set_page_config(layout="wide", page_title="Ley Line Network Generator")
 
+@st.cache_resource
+def get_generation_cache():
+    """Generation cache shared across reruns and sessions, persisted to disk."""
+    return GenerationCache(maxsize=64, cache_dir=".leyline_cache")
+
+# Export formats offered in the UI: label -> (file name, MIME type), and export_bytes format
+EXPORT_OPTIONS = {
+    "JSON": ("ley_line_network.json", "application/json"),
+    "Compressed JSON": ("ley_line_network.json.gz", "application/gzip"),
+    "Binary": ("ley_line_network.leynet", "application/octet-stream")
+}
+EXPORT_FORMAT_CODES = {"JSON": "json", "Compressed JSON": "json.gz", "Binary": "binary"}
+
+@st.cache_resource(max_entries=4)
+def get_network_arrays(network_key, _data, radius):
+    """Columnar copy of a network kept across reruns, so results cached on its analysis persist."""
+    return NetworkArrays.from_legacy(_data, radius)
+
+@st.cache_data(max_entries=16, show_spinner="Preparing export...")
+def get_export_bytes(network_key, export_format, _data):
+    """Encoded network for download, cached per (network, format); _data is not hashed."""
+    return export_bytes(_data, export_format)
+
+@st.cache_data(max_entries=4, show_spinner="Preparing batch export...")
+def get_batch_export_bytes(batch_id, _results):
+    """Encoded batch results for download, cached per batch run; _results is not hashed."""
+    return export_batch_bytes(_results)
+
 # Load custom CSS
 with open("styles.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
@@ -61,12 +83,15 @@ with st.sidebar:
         solid_type = preset_config["solid_type"]
         radius = preset_config["radius"]
         max_distance = preset_config["max_distance"]
+        frequency = preset_config.get("frequency", 1)
         
         # Show current preset values
         st.subheader("Current Preset Configuration")
         st.write(f"Solid Type: {solid_type}")
         st.write(f"Radius: {radius} km")
         st.write(f"Max Distance: {max_distance} km")
+        if solid_type in ("geodesic", "goldberg"):
+            st.write(f"Frequency: {frequency}")
         
         # Delete preset button
         if st.button("Delete Selected Preset", key="delete_preset"):
@@ -80,11 +105,23 @@ with st.sidebar:
         
         solid_type = st.selectbox(
             "Platonic Solid Type",
-            ["tetrahedron", "cube", "octahedron", "dodecahedron", "icosahedron"],
+            ["tetrahedron", "cube", "octahedron", "dodecahedron", "icosahedron", "geodesic", "goldberg"],
             help="The base platonic solid used to generate the network",
             key="solid_type_selector"
         )
         
+        frequency = 1
+        if solid_type in ("geodesic", "goldberg"):
+            frequency = st.number_input(
+                "Subdivision Frequency",
+                min_value=1,
+                max_value=50,
+                value=4,
+                step=1,
+                help="Number of segments per icosahedron edge; ley lines follow the mesh edges",
+                key="frequency_input"
+            )
+        
         radius = st.number_input(
             "Sphere Radius (km)",
             min_value=1.0,
@@ -113,6 +150,8 @@ with st.sidebar:
                 "radius": radius,
                 "max_distance": max_distance
             }
+            if solid_type in ("geodesic", "goldberg"):
+                new_preset["frequency"] = frequency
             presets[preset_name] = new_preset
             save_presets(presets)
             st.success(f"Preset '{preset_name}' saved successfully!")
@@ -121,10 +160,12 @@ with st.sidebar:
 # Main content area
 try:
     # Generate the network
-    data = generate_nodes_and_ley_lines(
+    data = cached_generate_nodes_and_ley_lines(
         solid_type=solid_type,
         radius=radius,
-        max_distance=max_distance
+        max_distance=max_distance,
+        frequency=frequency,
+        cache=get_generation_cache()
     )
     
     # Geo-location inputs in sidebar
@@ -137,13 +178,49 @@ try:
                                     key="reference_longitude")
     reference_point = {"latitude": ref_lat, "longitude": ref_lon} if ref_lat != 0 or ref_lon != 0 else None
     
+    # Rendering controls in sidebar
+    st.sidebar.subheader("Display")
+    level_of_detail = st.sidebar.checkbox("Level of detail", value=True,
+                                          help="Aggregate nodes and bundle ley lines when the network exceeds the render budget",
+                                          key="level_of_detail")
+    render_budget = st.sidebar.number_input("Render budget (primitives)", min_value=100, max_value=500000,
+                                            value=20000, step=1000,
+                                            help="Maximum number of node markers plus ley line segments to draw, arc segments included",
+                                            key="render_budget")
+    mesh_resolution = st.sidebar.slider("Globe mesh resolution", min_value=20, max_value=200, value=100, step=10,
+                                        help="Grid points per axis of the sphere surface",
+                                        key="mesh_resolution")
+    great_circle = st.sidebar.checkbox("Great-circle arcs", value=False,
+                                       help="Draw ley lines along the sphere instead of as straight chords",
+                                       key="great_circle_arcs")
+    arc_points = None
+    if great_circle:
+        arc_points = st.sidebar.slider("Arc points", min_value=4, max_value=128, value=32, step=4,
+                                       help="Vertices of an arc spanning half the globe; shorter arcs use fewer",
+                                       key="arc_points")
+    
     # Create visualization
     col1, col2 = st.columns([2, 1])
 
     with col1:
         st.subheader("Network Visualization")
-        fig = create_globe_visualization(data["nodes"], data["ley_lines"], radius, reference_point)
+        max_primitives = render_budget if level_of_detail else None
+        # Reuse the figure across reruns; a new reference point only patches its own traces
+        figure_key = (solid_type, radius, max_distance, frequency, max_primitives, mesh_resolution, arc_points)
+        cached_figure = st.session_state.get("globe_figure")
+        if cached_figure is not None and cached_figure[0] == figure_key:
+            fig = update_reference_point(cached_figure[1], reference_point, radius, mesh_resolution)
+        else:
+            fig = create_globe_visualization(data["nodes"], data["ley_lines"], radius, reference_point,
+                                             max_primitives=max_primitives, resolution=mesh_resolution,
+                                             arc_points=arc_points)
+            st.session_state["globe_figure"] = (figure_key, fig)
         st.plotly_chart(fig, use_container_width=True)
+        lod = fig.layout.meta["lod"]
+        if lod["level"] == "aggregated":
+            st.caption(f"Level of detail: drawing {lod['drawn_nodes']} node clusters and "
+                       f"{lod['drawn_ley_lines']} bundled ley lines ({lod['drawn_fraction']:.1%} of all primitives, "
+                       f"covering {lod['ley_lines_represented']:.1%} of ley lines).")
     
     with col2:
         st.subheader("Network Statistics")
@@ -153,7 +230,71 @@ try:
         primary_lines = sum(1 for line in data['ley_lines'] if line['category'] == 'primary')
         st.write(f"Primary Ley Lines: {primary_lines}")
         st.write(f"Secondary Ley Lines: {len(data['ley_lines']) - primary_lines}")
-    
+
+        # Timings come from the run that produced this network; cache hits show the original run
+        timings = data['metadata'].get('timings')
+        if timings:
+            with st.expander("Where the time went"):
+                spans = pd.DataFrame({
+                    "Stage": list(timings['spans']),
+                    "Seconds": list(timings['spans'].values())
+                })
+                spans["Share"] = spans["Seconds"] / max(timings['total_seconds'], 1e-12)
+                st.bar_chart(spans.set_index("Stage")["Seconds"])
+                st.dataframe(spans.style.format({"Seconds": "{:.4f}", "Share": "{:.1%}"}))
+                counters = timings['counters']
+                st.write(f"Pairs evaluated: {counters.get('pairs_evaluated', 0):,}")
+                st.write(f"Pairs pruned: {counters.get('pairs_pruned', 0):,}")
+                st.write(f"Ley lines emitted: {counters.get('edges_emitted', 0):,}")
+                st.caption(f"Total generation time: {timings['total_seconds']:.4f} s")
+
+    # Network Analysis section; results are cached on the network held by get_network_arrays
+    st.header("Network Analysis")
+    network = get_network_arrays((solid_type, radius, max_distance, frequency), data, radius)
+    analysis = network.analysis
+    betweenness_samples = st.slider(
+        "Betweenness Samples",
+        min_value=8,
+        max_value=256,
+        value=64,
+        step=8,
+        help="Source nodes sampled to estimate betweenness; networks with fewer nodes are measured exactly"
+    )
+    with st.spinner("Analysing network..."):
+        summary = analysis.summary(betweenness_samples)
+
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Components", summary['components']['count'])
+    metric_cols[1].metric("Largest Component", f"{summary['components']['largest']} nodes")
+    metric_cols[2].metric("Mean Degree", f"{summary['degree']['mean']:.2f}")
+    metric_cols[3].metric("Spanning Tree Length", f"{summary['minimum_spanning_tree']['total_length']:,.0f} km")
+
+    col5, col6 = st.columns(2)
+    with col5:
+        st.write("Degree Distribution")
+        st.bar_chart(pd.DataFrame({"Nodes": summary['degree']['histogram']}))
+        lengths = summary['ley_line_length']
+        st.caption(f"{summary['degree']['isolated']} isolated nodes; ley lines span "
+                   f"{lengths['min']:,.1f}–{lengths['max']:,.1f} km (mean {lengths['mean']:,.1f} km).")
+    with col6:
+        st.write("Most Central Nodes")
+        st.dataframe(pd.DataFrame(summary['betweenness']['top'], columns=["Node", "Betweenness"]), hide_index=True)
+
+    st.subheader("Shortest Ley Line Route")
+    path_cols = st.columns(2)
+    source = path_cols[0].number_input("From node", min_value=0, max_value=network.num_nodes - 1, value=0,
+                                       step=1, key="path_source")
+    target = path_cols[1].number_input("To node", min_value=0, max_value=network.num_nodes - 1,
+                                       value=network.num_nodes - 1, step=1, key="path_target")
+    path = analysis.shortest_path(int(source), int(target))
+    if np.isinf(path.distance):
+        st.warning(f"No ley line route connects {network.node_id(int(source))} and {network.node_id(int(target))}.")
+    else:
+        route = [network.node_id(k) for k in path.nodes]
+        if len(route) > 12:
+            route = route[:6] + ["…"] + route[-5:]
+        st.write(f"{path.distance:,.1f} km over {len(path.ley_lines)} ley lines: {' → '.join(route)}")
+
     # Batch Generation section
     st.header("Batch Generation")
     tab1, tab2 = st.tabs(["Configuration", "Results"])
@@ -195,128 +336,91 @@ try:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            total_configs = len(batch_solid_types)
-            current_config = 0
+            def update_progress(completed, total, result):
+                status_text.text(f"Generated: {result['configuration']['solid_type']} ({completed}/{total})")
+                progress_bar.progress(completed / total)
             
-            for solid in batch_solid_types:
-                status_text.text(f"Generating: {solid}")
-                try:
-                    # Generate initial configuration
-                    config_data = generate_nodes_and_ley_lines(
-                        solid_type=solid,
-                        radius=batch_radius,
-                        max_distance=batch_max_distance,
-                        auto_adjust=auto_adjust
-                    )
+            # Run all configurations concurrently; results come back in selection order
+            batch_output = run_batch(
+                [(solid, batch_radius, batch_max_distance, auto_adjust) for solid in batch_solid_types],
+                executor='thread',
+                progress_callback=update_progress
+            )
+            
+            for result in batch_output:
+                solid = result["configuration"]["solid_type"]
+                if "error" in result:
+                    st.warning(f"Skipping invalid configuration - {solid}: {result['error']}")
+                    continue
+                
+                batch_results.append(result)
+                config_data = result["data"]
+                nodes_valid = result["validation"]["nodes_valid"]
+                nodes_message = result["validation"]["nodes_message"]
+                connections_valid = result["validation"]["connections_valid"]
+                connections_message = result["validation"]["connections_message"]
+                parameter_suggestions = result["validation"]["parameter_suggestions"]
+                
+                # Display validation results and connection statistics in a cleaner format
+                with st.container():
+                    st.markdown(f"### Configuration Results - {solid}")
                     
-                    # Validate the configuration
-                    nodes_valid, nodes_message = validate_platonic_solid_nodes(
-                        config_data["nodes"],
-                        solid
-                    )
-                    connections_valid, connections_message = validate_ley_line_connections(
-                        config_data["nodes"],
-                        config_data["ley_lines"],
-                        batch_max_distance
-                    )
+                    # Create two columns for original and adjusted parameters
+                    col1, col2 = st.columns(2)
                     
-                    # Get parameter suggestions
-                    parameter_suggestions = suggest_distance_parameters(config_data["nodes"])
+                    with col1:
+                        st.markdown("**Original Parameters**")
+                        st.write(f"Max Distance: {batch_max_distance:.2f} km")
+                        st.write(f"Auto-adjust: {'Enabled' if auto_adjust else 'Disabled'}")
                     
-                    batch_results.append({
-                        "configuration": {
-                            "solid_type": solid,
-                            "radius": batch_radius,
-                            "max_distance": batch_max_distance,
-                            "auto_adjust_enabled": auto_adjust
-                        },
-                        "data": config_data,
-                        "validation": {
-                            "nodes_valid": nodes_valid,
-                            "nodes_message": nodes_message,
-                            "connections_valid": connections_valid,
-                            "connections_message": connections_message,
-                            "parameter_suggestions": parameter_suggestions
-                        },
-                        "statistics": {
-                            "total_nodes": len(config_data["nodes"]),
-                            "total_ley_lines": len(config_data["ley_lines"]),
-                            "primary_ley_lines": sum(1 for line in config_data["ley_lines"] if line["category"] == "primary")
-                        }
-                    })
+                    with col2:
+                        st.markdown("**Suggested Parameters**")
+                        st.write(f"Min Distance: {parameter_suggestions['min_distance']:.2f} km")
+                        st.write(f"Max Distance: {parameter_suggestions['max_distance']:.2f} km")
                     
-                    # Display validation results and connection statistics in a cleaner format
-                    with st.container():
-                        st.markdown(f"### Configuration Results - {solid}")
-                        
-                        # Create two columns for original and adjusted parameters
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown("**Original Parameters**")
-                            st.write(f"Max Distance: {batch_max_distance:.2f} km")
-                            st.write(f"Auto-adjust: {'Enabled' if auto_adjust else 'Disabled'}")
-                        
-                        with col2:
-                            st.markdown("**Suggested Parameters**")
-                            st.write(f"Min Distance: {parameter_suggestions['min_distance']:.2f} km")
-                            st.write(f"Max Distance: {parameter_suggestions['max_distance']:.2f} km")
-                        
-                        # Display validation results
-                        st.markdown("**Validation Results**")
-                        col3, col4 = st.columns(2)
-                        
-                        with col3:
-                            st.metric(
-                                "Node Validation",
-                                "Passed" if nodes_valid else "Failed",
-                                nodes_message
-                            )
-                        
-                        with col4:
-                            st.metric(
-                                "Connection Validation",
-                                "Passed" if connections_valid else "Failed",
-                                connections_message
-                            )
-                        
-                        # Display connection statistics
-                        st.markdown("**Connection Statistics**")
-                        stats = config_data.get("metadata", {}).get("connection_stats", {})
-                        col5, col6 = st.columns(2)
-                        
-                        with col5:
-                            attempted = stats.get("attempted", 0)
-                            successful = stats.get("successful", 0)
-                            success_rate = (successful / attempted * 100) if attempted > 0 else 0
-                            st.metric(
-                                "Connection Success Rate",
-                                f"{success_rate:.1f}%",
-                                f"{successful}/{attempted} connections"
-                            )
-                        
-                        with col6:
-                            st.metric(
-                                "Network Density",
-                                f"{len(config_data['ley_lines'])}/{len(config_data['nodes'])} nodes",
-                                f"Average: {len(config_data['ley_lines'])/len(config_data['nodes']):.1f} lines per node"
-                            )
-                    current_config += 1
-                    progress_bar.progress(current_config / total_configs)
+                    # Display validation results
+                    st.markdown("**Validation Results**")
+                    col3, col4 = st.columns(2)
                     
-                except ValueError as e:
-                    st.warning(f"Skipping invalid configuration - {solid}: {str(e)}")
-                    current_config += 1
-                    progress_bar.progress(current_config / total_configs)
-            
-            # Export batch results
-            json_str = json.dumps(batch_results, indent=2)
-            b64 = base64.b64encode(json_str.encode()).decode()
-            href = f'<a href="data:file/json;base64,{b64}" download="batch_configurations.json">Download Batch Results (JSON)</a>'
-            st.markdown(href, unsafe_allow_html=True)
-            
-            # Generate timestamp for exports
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M")
+                    with col3:
+                        st.metric(
+                            "Node Validation",
+                            "Passed" if nodes_valid else "Failed",
+                            nodes_message
+                        )
+                    
+                    with col4:
+                        st.metric(
+                            "Connection Validation",
+                            "Passed" if connections_valid else "Failed",
+                            connections_message
+                        )
+                    
+                    # Display connection statistics
+                    st.markdown("**Connection Statistics**")
+                    stats = config_data.get("metadata", {}).get("connection_stats", {})
+                    col5, col6 = st.columns(2)
+                    
+                    with col5:
+                        attempted = stats.get("attempted", 0)
+                        successful = stats.get("successful", 0)
+                        success_rate = (successful / attempted * 100) if attempted > 0 else 0
+                        st.metric(
+                            "Connection Success Rate",
+                            f"{success_rate:.1f}%",
+                            f"{successful}/{attempted} {'mesh edges' if 'mesh_edges' in stats else 'connections'}"
+                        )
+                    
+                    with col6:
+                        st.metric(
+                            "Network Density",
+                            f"{len(config_data['ley_lines'])}/{len(config_data['nodes'])} nodes",
+                            f"Average: {len(config_data['ley_lines'])/len(config_data['nodes']):.1f} lines per node"
+                        )
+        
+            # Keep the results for the download, which is only encoded when requested
+            st.session_state["batch_results"] = (datetime.now().isoformat(), batch_results)
+            st.session_state.pop("batch_export_request", None)
             
             # Display final summary in Results tab
             tab2.markdown("---")
@@ -361,16 +465,38 @@ try:
             
             st.dataframe(pd.DataFrame(summary_data))
 
+        if "batch_results" in st.session_state:
+            batch_id, stored_results = st.session_state["batch_results"]
+            if st.button("Prepare Batch Download", key="prepare_batch_download"):
+                st.session_state["batch_export_request"] = batch_id
+            if st.session_state.get("batch_export_request") == batch_id:
+                st.download_button(
+                    "Download Batch Results (JSON)",
+                    data=get_batch_export_bytes(batch_id, stored_results),
+                    file_name="batch_configurations.json",
+                    mime="application/json",
+                    key="batch_download"
+                )
+
     # Export section
     st.subheader("Export Current Configuration")
     col3, col4 = st.columns(2)
     
     with col3:
-        # Export as JSON
-        json_str = json.dumps(data, indent=2)
-        b64 = base64.b64encode(json_str.encode()).decode()
-        href = f'<a href="data:file/json;base64,{b64}" download="ley_line_network.json">Download Current Configuration (JSON)</a>'
-        st.markdown(href, unsafe_allow_html=True)
+        # Bytes are only produced once a format is requested, then cached per network
+        export_format = st.selectbox("Export format", list(EXPORT_OPTIONS), key="export_format")
+        network_key = (solid_type, radius, max_distance, frequency)
+        if st.button("Prepare Download", key="prepare_download"):
+            st.session_state["export_request"] = (network_key, export_format)
+        if st.session_state.get("export_request") == (network_key, export_format):
+            file_name, mime = EXPORT_OPTIONS[export_format]
+            st.download_button(
+                f"Download Current Configuration ({export_format})",
+                data=get_export_bytes(network_key, EXPORT_FORMAT_CODES[export_format], data),
+                file_name=file_name,
+                mime=mime,
+                key="network_download"
+            )
     
     with col4:
         # Preview JSON
@@ -0,0 +1,386 @@
+import heapq
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from distance_engine import haversine_distances
+from network_arrays import NetworkArrays
+
+# Source nodes sampled by approximate_betweenness; all nodes are used when there are fewer
+DEFAULT_BETWEENNESS_SAMPLES = 64
+
+# Result of shortest_path: total great-circle length in kilometers, the node indices
+# along the path and the ley line indices joining them (empty when unreachable)
+ShortestPath = namedtuple('ShortestPath', ['distance', 'nodes', 'ley_lines'])
+
+def as_network_arrays(data, radius: float = 6371) -> NetworkArrays:
+    """
+    Columnar view of a network for analysis.
+
+    Args:
+        data: NetworkArrays, or a legacy nodes/ley_lines dictionary.
+        radius (float): Radius of the sphere in kilometers (legacy dictionaries only).
+
+    Returns:
+        NetworkArrays: The network itself, or a columnar copy of the dictionary.
+    """
+    if isinstance(data, NetworkArrays):
+        return data
+    return NetworkArrays.from_legacy(data, radius)
+
+def edge_lengths(network: NetworkArrays) -> np.ndarray:
+    """
+    Great-circle length of every ley line.
+
+    Returns:
+        numpy.ndarray: Lengths in kilometers, in ley line order.
+    """
+    lat = np.radians(network.lat)
+    lon = np.radians(network.lon)
+    u = network.edges[:, 0]
+    v = network.edges[:, 1]
+    return haversine_distances(lat[u], lon[u], lat[v], lon[v], network.radius)
+
+def _merge_labels(labels: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Merge the label sets joined by edges (u, v) with min-label propagation.
+
+    Every round hooks the larger root label of each crossing edge onto the smaller
+    one and then pointer-jumps (labels = labels[labels]) until every label points at
+    its root, so all work is array operations over the edge list. Labels only ever
+    decrease, so the final root of each set is its smallest member.
+
+    Args:
+        labels (numpy.ndarray): Star-shaped labels (labels[labels] == labels), e.g. arange(n).
+        u (numpy.ndarray): First endpoint of each edge.
+        v (numpy.ndarray): Second endpoint of each edge.
+
+    Returns:
+        numpy.ndarray: New star-shaped labels.
+    """
+    labels = labels.copy()
+    while True:
+        lu = labels[u]
+        lv = labels[v]
+        crossing = lu != lv
+        if not crossing.any():
+            return labels
+        lu = lu[crossing]
+        lv = lv[crossing]
+        np.minimum.at(labels, np.maximum(lu, lv), np.minimum(lu, lv))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+def connected_components(network: NetworkArrays) -> tuple:
+    """
+    Connected components by label propagation with pointer jumping.
+
+    Returns:
+        tuple: (labels, sizes) - component number of every node, numbered in order of
+               each component's smallest node index, and the node count of each component.
+    """
+    roots = _merge_labels(np.arange(network.num_nodes, dtype=np.int64),
+                          network.edges[:, 0].astype(np.int64), network.edges[:, 1].astype(np.int64))
+    _, labels, sizes = np.unique(roots, return_inverse=True, return_counts=True)
+    return labels.reshape(-1), sizes
+
+def degree_distribution(network: NetworkArrays) -> dict:
+    """
+    Summary of the number of ley lines per node.
+
+    Returns:
+        dict: 'histogram' (number of nodes with degree 0, 1, 2, ...), 'min', 'max',
+              'mean', 'median' and 'isolated' (nodes without ley lines).
+    """
+    degrees = network.degree()
+    if len(degrees) == 0:
+        return {'histogram': [], 'min': 0, 'max': 0, 'mean': 0.0, 'median': 0.0, 'isolated': 0}
+    histogram = np.bincount(degrees)
+    return {
+        'histogram': histogram.tolist(),
+        'min': int(degrees.min()),
+        'max': int(degrees.max()),
+        'mean': float(degrees.mean()),
+        'median': float(np.median(degrees)),
+        'isolated': int(histogram[0])
+    }
+
+def shortest_path(network: NetworkArrays, source: int, target: int, lengths: np.ndarray = None,
+                  heuristic: bool = True) -> ShortestPath:
+    """
+    Shortest route along ley lines between two nodes, weighted by great-circle length.
+
+    With heuristic=True this is A* guided by the direct great-circle distance to the
+    target, which never overestimates (every ley line is itself a great-circle arc),
+    so the result equals Dijkstra's while settling fewer nodes.
+
+    Args:
+        network (NetworkArrays): Network to search.
+        source (int): Index of the start node.
+        target (int): Index of the end node.
+        lengths (numpy.ndarray): Ley line lengths from edge_lengths(), computed when omitted.
+        heuristic (bool): Use A*; plain Dijkstra when False.
+
+    Returns:
+        ShortestPath: Distance (inf when unreachable), node indices and ley line indices.
+
+    Raises:
+        IndexError: If source or target is not a node index.
+    """
+    num_nodes = network.num_nodes
+    if not (0 <= source < num_nodes and 0 <= target < num_nodes):
+        raise IndexError(f"Node index out of range for a network of {num_nodes} nodes.")
+    if lengths is None:
+        lengths = edge_lengths(network)
+
+    if heuristic:
+        lat = np.radians(network.lat)
+        lon = np.radians(network.lon)
+        estimate = haversine_distances(lat, lon, lat[target], lon[target], network.radius)
+    else:
+        estimate = np.zeros(num_nodes)
+
+    indptr = network.indptr
+    best = {source: 0.0}
+    previous = {}
+    settled = set()
+    queue = [(float(estimate[source]), 0.0, source)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if node in settled:
+            continue
+        if node == target:
+            break
+        settled.add(node)
+        start, stop = indptr[node], indptr[node + 1]
+        for other, line in zip(network.indices[start:stop].tolist(), network.adjacency_edges[start:stop].tolist()):
+            candidate = distance + lengths[line]
+            if candidate < best.get(other, math.inf):
+                best[other] = candidate
+                previous[other] = (node, line)
+                heapq.heappush(queue, (candidate + estimate[other], candidate, other))
+
+    if target not in best:
+        return ShortestPath(math.inf, [], [])
+    nodes = [target]
+    ley_lines = []
+    while nodes[-1] != source:
+        node, line = previous[nodes[-1]]
+        nodes.append(node)
+        ley_lines.append(line)
+    return ShortestPath(float(best[target]), nodes[::-1], ley_lines[::-1])
+
+def _gather_neighbors(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> tuple:
+    """Every (node, neighbour) CSR entry of the frontier nodes, as two aligned arrays."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    return np.repeat(frontier, counts), indices[offsets]
+
+def approximate_betweenness(network: NetworkArrays, samples: int = DEFAULT_BETWEENNESS_SAMPLES,
+                            seed: int = 0, normalized: bool = True) -> np.ndarray:
+    """
+    Betweenness centrality (hop count) estimated from sampled Brandes sources.
+
+    Each sampled source runs a level-synchronous breadth-first search over the CSR
+    arrays, counting shortest paths per level, and dependencies are accumulated back
+    level by level, so every step is a vectorized array operation. Path counts are
+    kept as logarithms because they grow exponentially on large meshes. Scores are
+    scaled by num_nodes / samples; with samples >= num_nodes the result is exact.
+
+    Args:
+        network (NetworkArrays): Network to analyse.
+        samples (int): Number of source nodes.
+        seed (int): Random seed for the source sample.
+        normalized (bool): Divide by the number of node pairs excluding the node itself.
+
+    Returns:
+        numpy.ndarray: Betweenness score of every node.
+    """
+    num_nodes = network.num_nodes
+    scores = np.zeros(num_nodes)
+    if num_nodes < 3:
+        return scores
+    if samples >= num_nodes:
+        sources = np.arange(num_nodes)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(num_nodes, samples, replace=False))
+    indptr = network.indptr
+    indices = network.indices.astype(np.int64)
+
+    for source in sources.tolist():
+        depth = np.full(num_nodes, -1, dtype=np.int64)
+        log_paths = np.full(num_nodes, -np.inf)
+        depth[source] = 0
+        log_paths[source] = 0.0
+        frontier = np.array([source], dtype=np.int64)
+        levels = []
+        level = 0
+        while len(frontier):
+            parents, children = _gather_neighbors(indptr, indices, frontier)
+            children_unseen = children[depth[children] < 0]
+            depth[children_unseen] = level + 1
+            forward = depth[children] == level + 1
+            parents = parents[forward]
+            children = children[forward]
+            if not len(children):
+                break
+            np.logaddexp.at(log_paths, children, log_paths[parents])
+            levels.append((parents, children))
+            frontier = np.unique(children)
+            level += 1
+
+        dependency = np.zeros(num_nodes)
+        for parents, children in reversed(levels):
+            share = np.exp(log_paths[parents] - log_paths[children]) * (1.0 + dependency[children])
+            np.add.at(dependency, parents, share)
+        dependency[source] = 0.0
+        scores += dependency
+
+    # Each undirected path is seen from both ends when every node is a source
+    scores *= num_nodes / len(sources) / 2.0
+    if normalized:
+        scores /= (num_nodes - 1) * (num_nodes - 2) / 2.0
+    return scores
+
+def minimum_spanning_tree(network: NetworkArrays, lengths: np.ndarray = None) -> np.ndarray:
+    """
+    Minimum spanning forest by great-circle length, using Borůvka's algorithm.
+
+    Every round each component picks its shortest outgoing ley line (ties broken by
+    ley line index, so the choice is unique and no cycle can form) with a scatter-min
+    over the edge array, and the picked lines merge components through label
+    propagation. There are at most log2(num_nodes) rounds.
+
+    Args:
+        network (NetworkArrays): Network to analyse.
+        lengths (numpy.ndarray): Ley line lengths from edge_lengths(), computed when omitted.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the ley lines in the forest (one tree per component).
+    """
+    num_edges = network.num_ley_lines
+    if num_edges == 0:
+        return np.empty(0, dtype=np.int64)
+    if lengths is None:
+        lengths = edge_lengths(network)
+    u = network.edges[:, 0].astype(np.int64)
+    v = network.edges[:, 1].astype(np.int64)
+    order = np.lexsort((np.arange(num_edges), lengths))
+    rank = np.empty(num_edges, dtype=np.int64)
+    rank[order] = np.arange(num_edges)
+
+    components = np.arange(network.num_nodes, dtype=np.int64)
+    chosen = np.zeros(num_edges, dtype=bool)
+    candidates = np.arange(num_edges)
+    while True:
+        cu = components[u[candidates]]
+        cv = components[v[candidates]]
+        crossing = cu != cv
+        candidates = candidates[crossing]
+        if not len(candidates):
+            break
+        cu = cu[crossing]
+        cv = cv[crossing]
+        cheapest = np.full(network.num_nodes, num_edges, dtype=np.int64)
+        np.minimum.at(cheapest, cu, rank[candidates])
+        np.minimum.at(cheapest, cv, rank[candidates])
+        picked = order[np.unique(cheapest[cheapest < num_edges])]
+        chosen[picked] = True
+        components = _merge_labels(components, u[picked], v[picked])
+    return np.nonzero(chosen)[0]
+
+class NetworkAnalysis:
+    """
+    Graph analytics for one network, computed on first request and kept for reuse.
+
+    Obtain it through ``NetworkArrays.analysis`` so the results live as long as the
+    network does; the network must not change afterwards.
+    """
+
+    def __init__(self, network: NetworkArrays):
+        self.network = network
+        self._results = {}
+
+    def _cached(self, key, compute):
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def edge_lengths(self) -> np.ndarray:
+        return self._cached('edge_lengths', lambda: edge_lengths(self.network))
+
+    def connected_components(self) -> tuple:
+        return self._cached('components', lambda: connected_components(self.network))
+
+    def degree_distribution(self) -> dict:
+        return self._cached('degrees', lambda: degree_distribution(self.network))
+
+    def minimum_spanning_tree(self) -> np.ndarray:
+        return self._cached('mst', lambda: minimum_spanning_tree(self.network, self.edge_lengths()))
+
+    def betweenness(self, samples: int = DEFAULT_BETWEENNESS_SAMPLES, seed: int = 0) -> np.ndarray:
+        return self._cached(('betweenness', samples, seed),
+                            lambda: approximate_betweenness(self.network, samples, seed))
+
+    def shortest_path(self, source: int, target: int) -> ShortestPath:
+        return self._cached(('path', source, target),
+                            lambda: shortest_path(self.network, source, target, self.edge_lengths()))
+
+    def summary(self, samples: int = DEFAULT_BETWEENNESS_SAMPLES, top: int = 10) -> dict:
+        """
+        JSON-serialisable overview of the network structure.
+
+        Args:
+            samples (int): Betweenness source samples.
+            top (int): Number of most central nodes and largest component sizes to list.
+
+        Returns:
+            dict: 'components', 'degree', 'ley_line_length', 'minimum_spanning_tree'
+                  and 'betweenness' sections.
+        """
+        network = self.network
+        labels, sizes = self.connected_components()
+        lengths = self.edge_lengths()
+        tree = self.minimum_spanning_tree()
+        scores = self.betweenness(samples)
+        central = np.argsort(-scores, kind='stable')[:top]
+        return {
+            'components': {
+                'count': len(sizes),
+                'largest': int(sizes.max()) if len(sizes) else 0,
+                'sizes': np.sort(sizes)[::-1][:top].tolist()
+            },
+            'degree': self.degree_distribution(),
+            'ley_line_length': {
+                'min': float(lengths.min()) if len(lengths) else 0.0,
+                'mean': float(lengths.mean()) if len(lengths) else 0.0,
+                'max': float(lengths.max()) if len(lengths) else 0.0,
+                'total': float(lengths.sum())
+            },
+            'minimum_spanning_tree': {
+                'ley_lines': len(tree),
+                'total_length': float(lengths[tree].sum())
+            },
+            'betweenness': {
+                'samples': min(samples, network.num_nodes),
+                'top': [(network.node_id(k), float(scores[k])) for k in central.tolist()]
+            }
+        }
+
+def analyze_network(data, radius: float = 6371) -> NetworkAnalysis:
+    """
+    Cached analytics for a network.
+
+    Args:
+        data: NetworkArrays (results are cached on it), or a legacy dictionary.
+        radius (float): Radius of the sphere in kilometers (legacy dictionaries only).
+
+    Returns:
+        NetworkAnalysis: Analysis bound to the (columnar) network.
+    """
+    return as_network_arrays(data, radius).analysis
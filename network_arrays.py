@@ -0,0 +1,344 @@
+import numpy as np
+
+# Default category vocabularies, matching the strings used by the legacy dict format
+NODE_CATEGORIES = ('major_node',)
+LEY_LINE_CATEGORIES = ('primary', 'secondary')
+
+def build_csr_adjacency(num_nodes: int, edges: np.ndarray) -> tuple:
+    """
+    Build CSR adjacency for an undirected edge list.
+
+    Neighbours of every node are stored in edge order, which matches the order in
+    which connect_nodes appends to ``nearby_nodes`` and ``associated_ley_lines``.
+
+    Args:
+        num_nodes (int): Number of nodes.
+        edges (numpy.ndarray): Array of shape (m, 2) with node index pairs.
+
+    Returns:
+        tuple: (indptr, indices, edge_ids) where the neighbours of node k are
+               indices[indptr[k]:indptr[k + 1]] and edge_ids gives the matching edge.
+    """
+    num_edges = len(edges)
+    endpoints = np.concatenate((edges[:, 0], edges[:, 1])).astype(np.int64)
+    others = np.concatenate((edges[:, 1], edges[:, 0])).astype(np.int32)
+    edge_ids = np.concatenate((np.arange(num_edges), np.arange(num_edges))).astype(np.int32)
+
+    order = np.lexsort((edge_ids, endpoints))
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(endpoints, minlength=num_nodes), out=indptr[1:])
+    return indptr, others[order], edge_ids[order]
+
+class NetworkArrays:
+    """
+    Compact columnar representation of a ley line network.
+
+    Nodes are stored as float64 latitude/longitude (degrees) and xyz (kilometers)
+    arrays with int8 category codes; ley lines as an int32 (m, 2) array of node
+    indices with int8 category codes; adjacency as CSR arrays. Node and ley line
+    ids follow the legacy ``node_NNN``/``leyline_NNN`` scheme and are derived from
+    the array position; networks whose ids do not follow that numbering (e.g. edited
+    ones with removed nodes) keep their original ids in ``node_ids``/``ley_line_ids``.
+
+    The legacy list-of-dicts view is produced lazily on first access through
+    ``to_legacy()`` or dict-style indexing (``network['nodes']``).
+    """
+
+    def __init__(self, latitudes, longitudes, edges, radius: float = 6371,
+                 node_categories=None, node_category_names: tuple = NODE_CATEGORIES,
+                 edge_categories=None, edge_category_names: tuple = LEY_LINE_CATEGORIES,
+                 metadata: dict = None, adjacency: tuple = None,
+                 node_ids: list = None, ley_line_ids: list = None):
+        """
+        Args:
+            latitudes: Node latitudes in degrees.
+            longitudes: Node longitudes in degrees.
+            edges: Array of shape (m, 2) with node index pairs, in ley line order.
+            radius (float): Radius of the sphere in kilometers.
+            node_categories: Per-node codes into node_category_names (all zero by default).
+            node_category_names (tuple): Node category vocabulary.
+            edge_categories: Per-edge codes into edge_category_names. By default a line is
+                             'primary' when both endpoints are 'major_node', else 'secondary'.
+            edge_category_names (tuple): Ley line category vocabulary.
+            metadata (dict): Generation metadata, as returned by generate_nodes_and_ley_lines.
+            adjacency (tuple): Precomputed (indptr, indices, edge_ids) from build_csr_adjacency,
+                               e.g. when loading a saved network; built from edges when None.
+            node_ids (list): Node ids in array order, or None for the ``node_NNN`` numbering.
+            ley_line_ids (list): Ley line ids in array order, or None for the ``leyline_NNN`` numbering.
+
+        Raises:
+            ValueError: If node_ids or ley_line_ids do not match the number of nodes or ley lines.
+        """
+        self.lat = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self.lon = np.ascontiguousarray(longitudes, dtype=np.float64)
+        self.edges = np.ascontiguousarray(np.asarray(edges).reshape(-1, 2), dtype=np.int32)
+        self.radius = float(radius)
+        self.node_category_names = tuple(node_category_names)
+        self.edge_category_names = tuple(edge_category_names)
+        self.metadata = metadata if metadata is not None else {}
+        self.node_ids = tuple(node_ids) if node_ids is not None else None
+        self.ley_line_ids = tuple(ley_line_ids) if ley_line_ids is not None else None
+        if self.node_ids is not None and len(self.node_ids) != len(self.lat):
+            raise ValueError(f"Expected {len(self.lat)} node ids, got {len(self.node_ids)}.")
+        if self.ley_line_ids is not None and len(self.ley_line_ids) != len(self.edges):
+            raise ValueError(f"Expected {len(self.edges)} ley line ids, got {len(self.ley_line_ids)}.")
+
+        if node_categories is None:
+            node_categories = np.zeros(len(self.lat), dtype=np.int8)
+        self.node_categories = np.ascontiguousarray(node_categories, dtype=np.int8)
+
+        if edge_categories is None:
+            major = np.zeros(len(self.lat), dtype=bool)
+            if 'major_node' in self.node_category_names:
+                major = self.node_categories == self.node_category_names.index('major_node')
+            both_major = major[self.edges[:, 0]] & major[self.edges[:, 1]]
+            edge_categories = np.where(both_major, self.edge_category_names.index('primary'),
+                                       self.edge_category_names.index('secondary'))
+        self.edge_categories = np.ascontiguousarray(edge_categories, dtype=np.int8)
+
+        if adjacency is None:
+            adjacency = build_csr_adjacency(len(self.lat), self.edges)
+        self.indptr, self.indices, self.adjacency_edges = adjacency
+        self._xyz = None
+        self._legacy = None
+        self._analysis = None
+
+    @property
+    def xyz(self) -> np.ndarray:
+        """Cartesian node positions in kilometers, computed on first access."""
+        if self._xyz is None:
+            lat_rad = np.radians(self.lat)
+            lon_rad = np.radians(self.lon)
+            cos_lat = np.cos(lat_rad)
+            self._xyz = self.radius * np.column_stack((cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)))
+        return self._xyz
+
+    @property
+    def analysis(self):
+        """Graph analytics for this network (network_analysis.NetworkAnalysis), cached on first access."""
+        if self._analysis is None:
+            from network_analysis import NetworkAnalysis
+            self._analysis = NetworkAnalysis(self)
+        return self._analysis
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.lat)
+
+    @property
+    def num_ley_lines(self) -> int:
+        return len(self.edges)
+
+    def degree(self, index: int = None):
+        """
+        Number of ley lines at a node, read from the CSR offsets.
+
+        Args:
+            index (int): Node index, or None for every node.
+
+        Returns:
+            int or numpy.ndarray: Degree of the node, or an int64 array of all degrees.
+        """
+        if index is None:
+            return np.diff(self.indptr)
+        return int(self.indptr[index + 1] - self.indptr[index])
+
+    def neighbors(self, index: int) -> np.ndarray:
+        """
+        Indices of the nodes joined to a node, in ley line order.
+
+        Returns:
+            numpy.ndarray: Read-only view into the CSR indices (a neighbour joined by
+                           several ley lines appears once per line).
+        """
+        view = self.indices[self.indptr[index]:self.indptr[index + 1]]
+        view.flags.writeable = False
+        return view
+
+    def incident_ley_lines(self, index: int) -> np.ndarray:
+        """
+        Indices of the ley lines at a node, aligned with neighbors(index).
+
+        Returns:
+            numpy.ndarray: Read-only view into the CSR edge ids.
+        """
+        view = self.adjacency_edges[self.indptr[index]:self.indptr[index + 1]]
+        view.flags.writeable = False
+        return view
+
+    def node_id(self, index: int) -> str:
+        if self.node_ids is not None:
+            return self.node_ids[index]
+        return f"node_{index:03}"
+
+    def ley_line_id(self, index: int) -> str:
+        if self.ley_line_ids is not None:
+            return self.ley_line_ids[index]
+        return f"leyline_{index:03}"
+
+    @classmethod
+    def from_legacy(cls, data: dict, radius: float = 6371) -> 'NetworkArrays':
+        """
+        Build the columnar representation from a legacy nodes/ley_lines dictionary.
+
+        Node and ley line ids are kept as given; they are stored explicitly only when
+        they differ from the positional ``node_NNN``/``leyline_NNN`` numbering.
+
+        Args:
+            data (dict): Dictionary with 'nodes', 'ley_lines' and optionally 'metadata'.
+            radius (float): Radius of the sphere in kilometers.
+
+        Returns:
+            NetworkArrays: Columnar copy of the network.
+        """
+        builder = NetworkArraysBuilder()
+        builder.add_nodes(data['nodes'])
+        builder.add_ley_lines(data['ley_lines'])
+        return builder.build(radius, data.get('metadata', {}))
+
+    def iter_nodes(self):
+        """
+        Yield legacy node dictionaries one at a time without materialising the full list.
+
+        Yields:
+            dict: Node dictionary in the legacy format.
+        """
+        lat = self.lat.tolist()
+        lon = self.lon.tolist()
+        categories = self.node_categories.tolist()
+        indptr = self.indptr.tolist()
+        for k in range(self.num_nodes):
+            start, stop = indptr[k], indptr[k + 1]
+            yield {
+                "id": self.node_id(k),
+                "coordinates": {"latitude": lat[k], "longitude": lon[k]},
+                "category": self.node_category_names[categories[k]],
+                "associated_ley_lines": [self.ley_line_id(e) for e in self.adjacency_edges[start:stop].tolist()],
+                "nearby_nodes": list(dict.fromkeys(self.node_id(j) for j in self.indices[start:stop].tolist()))
+            }
+
+    def iter_ley_lines(self):
+        """
+        Yield legacy ley line dictionaries one at a time.
+
+        Yields:
+            dict: Ley line dictionary in the legacy format.
+        """
+        categories = self.edge_categories.tolist()
+        for e, (i, j) in enumerate(self.edges.tolist()):
+            yield {
+                "id": self.ley_line_id(e),
+                "nodes": [self.node_id(i), self.node_id(j)],
+                "category": self.edge_category_names[categories[e]]
+            }
+
+    def to_legacy(self) -> dict:
+        """
+        Return the legacy dictionary view, building it on first use.
+
+        The returned dictionary is cached; changes made to it are not reflected in the arrays.
+
+        Returns:
+            dict: Dictionary with 'nodes', 'ley_lines' and 'metadata'.
+        """
+        if self._legacy is None:
+            self._legacy = {
+                "nodes": list(self.iter_nodes()),
+                "ley_lines": list(self.iter_ley_lines()),
+                "metadata": self.metadata
+            }
+        return self._legacy
+
+    def __getitem__(self, key: str):
+        if key == 'metadata':
+            return self.metadata
+        return self.to_legacy()[key]
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in ('nodes', 'ley_lines', 'metadata')
+
+    def keys(self):
+        return ('nodes', 'ley_lines', 'metadata')
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __repr__(self) -> str:
+        return f"NetworkArrays(nodes={self.num_nodes}, ley_lines={self.num_ley_lines}, radius={self.radius})"
+
+class NetworkArraysBuilder:
+    """
+    Accumulate legacy node and ley line records in chunks and assemble NetworkArrays.
+
+    Each chunk is converted to arrays as soon as it arrives, so only the columnar data
+    and the node id lookup are kept; ``associated_ley_lines`` and ``nearby_nodes`` are
+    dropped because they are rebuilt from the edges. Ley lines that arrive before
+    their nodes keep their endpoint ids until build().
+    """
+
+    def __init__(self):
+        self.index = {}
+        self._ley_line_ids = []
+        self.node_category_names = list(NODE_CATEGORIES)
+        self.edge_category_names = list(LEY_LINE_CATEGORIES)
+        self._lat, self._lon, self._node_codes = [], [], []
+        self._edges, self._edge_codes = [], []
+
+    @staticmethod
+    def _code(names: list, name: str) -> int:
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    def add_nodes(self, nodes: list):
+        """Append a chunk of legacy node dictionaries."""
+        count = len(nodes)
+        for node in nodes:
+            self.index[node['id']] = len(self.index)
+        self._lat.append(np.fromiter((node['coordinates']['latitude'] for node in nodes), dtype=np.float64, count=count))
+        self._lon.append(np.fromiter((node['coordinates']['longitude'] for node in nodes), dtype=np.float64, count=count))
+        self._node_codes.append(np.fromiter((self._code(self.node_category_names, node['category']) for node in nodes),
+                                            dtype=np.int8, count=count))
+
+    def add_ley_lines(self, ley_lines: list):
+        """Append a chunk of legacy ley line dictionaries."""
+        pairs = [line['nodes'] for line in ley_lines]
+        self._ley_line_ids.extend(line['id'] for line in ley_lines)
+        if all(a in self.index and b in self.index for a, b in pairs):
+            pairs = np.array([(self.index[a], self.index[b]) for a, b in pairs], dtype=np.int32).reshape(-1, 2)
+        self._edges.append(pairs)
+        self._edge_codes.append(np.fromiter((self._code(self.edge_category_names, line['category']) for line in ley_lines),
+                                            dtype=np.int8, count=len(ley_lines)))
+
+    def build(self, radius: float = 6371, metadata: dict = None) -> NetworkArrays:
+        """
+        Assemble the accumulated chunks.
+
+        Raises:
+            KeyError: If a ley line references an unknown node id.
+        """
+        node_ids = list(self.index)
+        ley_line_ids = self._ley_line_ids
+        if all(node_id == f"node_{k:03}" for k, node_id in enumerate(node_ids)):
+            node_ids = None
+        if all(line_id == f"leyline_{k:03}" for k, line_id in enumerate(ley_line_ids)):
+            ley_line_ids = None
+        edges = [chunk if isinstance(chunk, np.ndarray)
+                 else np.array([(self.index[a], self.index[b]) for a, b in chunk], dtype=np.int32).reshape(-1, 2)
+                 for chunk in self._edges]
+        return NetworkArrays(
+            np.concatenate(self._lat) if self._lat else np.empty(0),
+            np.concatenate(self._lon) if self._lon else np.empty(0),
+            np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int32),
+            radius,
+            np.concatenate(self._node_codes) if self._node_codes else None,
+            tuple(self.node_category_names),
+            np.concatenate(self._edge_codes) if self._edge_codes else np.empty(0, dtype=np.int8),
+            tuple(self.edge_category_names),
+            metadata if metadata is not None else {},
+            node_ids=node_ids,
+            ley_line_ids=ley_line_ids
+        )
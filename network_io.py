@@ -0,0 +1,532 @@
+import bz2
+import gzip
+import io
+import json
+import logging
+import lzma
+import os
+import re
+from itertools import islice
+
+import numpy as np
+
+from network_arrays import NetworkArrays, NetworkArraysBuilder
+
+logger = logging.getLogger(__name__)
+
+# File layout: magic, little-endian uint64 header length, UTF-8 JSON header, then the
+# raw little-endian arrays, each starting on a 64-byte boundary.
+BINARY_MAGIC = b'LEYNET01'
+BINARY_ALIGNMENT = 64
+
+# Stdlib codecs for compressed JSON, and the file extensions that select them
+JSON_COMPRESSIONS = {'gzip': gzip.open, 'bz2': bz2.open, 'lzma': lzma.open}
+_COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma', '.lzma': 'lzma'}
+
+# Characters read per refill by the incremental JSON reader, and records per loader chunk
+JSON_READ_SIZE = 1 << 20
+JSON_CHUNK_RECORDS = 65536
+
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+_VALUE_TERMINATORS = ',:]} \t\n\r'
+
+# Formats produced by export_bytes and export_batch_bytes
+EXPORT_FORMATS = ('json', 'json.gz', 'binary')
+BATCH_EXPORT_FORMATS = ('json', 'json.gz')
+
+# (name in the file, NetworkArrays attribute, on-disk dtype)
+_BINARY_ARRAYS = (
+    ('latitudes', 'lat', '<f8'),
+    ('longitudes', 'lon', '<f8'),
+    ('edges', 'edges', '<i4'),
+    ('node_categories', 'node_categories', '<i1'),
+    ('edge_categories', 'edge_categories', '<i1'),
+    ('indptr', 'indptr', '<i8'),
+    ('indices', 'indices', '<i4'),
+    ('adjacency_edges', 'adjacency_edges', '<i4')
+)
+
+def _align(offset: int) -> int:
+    return -(-offset // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+
+def write_binary(network, file):
+    """
+    Write a network in the binary container format to an open binary file object.
+
+    Node coordinates, ley line index pairs, category codes and CSR adjacency are
+    written as raw arrays so that load_binary can map them without parsing.
+
+    Args:
+        network: NetworkArrays or a legacy nodes/ley_lines dictionary.
+        file: Writable binary file object.
+    """
+    if not isinstance(network, NetworkArrays):
+        network = NetworkArrays.from_legacy(network)
+
+    arrays = []
+    descriptors = {}
+    offset = 0
+    for name, attribute, dtype in _BINARY_ARRAYS:
+        array = np.ascontiguousarray(getattr(network, attribute), dtype=dtype)
+        descriptors[name] = {"dtype": dtype, "shape": list(array.shape), "offset": offset}
+        arrays.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "format_version": 1,
+        "radius": network.radius,
+        "node_category_names": list(network.node_category_names),
+        "edge_category_names": list(network.edge_category_names),
+        "metadata": network.metadata,
+        "node_ids": list(network.node_ids) if network.node_ids is not None else None,
+        "ley_line_ids": list(network.ley_line_ids) if network.ley_line_ids is not None else None,
+        "arrays": descriptors
+    }).encode('utf-8')
+    data_start = _align(len(BINARY_MAGIC) + 8 + len(header))
+
+    written = 0
+    for block in (BINARY_MAGIC, len(header).to_bytes(8, 'little'), header):
+        file.write(block)
+        written += len(block)
+    for array_offset, array in arrays:
+        file.write(b'\0' * (data_start + array_offset - written))
+        file.write(array.tobytes())
+        written = data_start + array_offset + array.nbytes
+
+def save_binary(network, output_file: str):
+    """
+    Save a network to the binary container format atomically.
+
+    Args:
+        network: NetworkArrays or a legacy nodes/ley_lines dictionary.
+        output_file (str): Path to the output file.
+
+    Raises:
+        IOError: If the file cannot be written.
+    """
+    temp_file = output_file + '.tmp'
+    try:
+        with open(temp_file, "wb") as file:
+            write_binary(network, file)
+        os.replace(temp_file, output_file)
+        logger.info("Binary network saved to %s.", output_file)
+    except Exception as e:
+        logger.exception("Failed to save binary network to %s.", output_file)
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+def _read_header(file) -> tuple:
+    if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValueError("Not a ley line network binary file.")
+    header_length = int.from_bytes(file.read(8), 'little')
+    header = json.loads(file.read(header_length).decode('utf-8'))
+    return header, _align(len(BINARY_MAGIC) + 8 + header_length)
+
+def load_binary(input_file: str, mmap: bool = True) -> NetworkArrays:
+    """
+    Load a network saved by save_binary.
+
+    With mmap=True the arrays are read-only views into a memory map of the file, so
+    opening a network costs a header parse regardless of its size; pages are read
+    from disk only when touched.
+
+    Args:
+        input_file (str): Path to the binary file.
+        mmap (bool): Map the file instead of reading it into memory.
+
+    Returns:
+        NetworkArrays: The stored network.
+
+    Raises:
+        ValueError: If the file is not in the binary network format.
+    """
+    with open(input_file, "rb") as file:
+        header, data_start = _read_header(file)
+        if mmap:
+            buffer = np.memmap(file, dtype=np.uint8, mode='r')
+        else:
+            file.seek(0)
+            buffer = np.frombuffer(file.read(), dtype=np.uint8)
+
+    arrays = {}
+    for name, _, _ in _BINARY_ARRAYS:
+        descriptor = header["arrays"][name]
+        dtype = np.dtype(descriptor["dtype"])
+        shape = tuple(descriptor["shape"])
+        start = data_start + descriptor["offset"]
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    return NetworkArrays(
+        arrays["latitudes"], arrays["longitudes"], arrays["edges"], header["radius"],
+        arrays["node_categories"], tuple(header["node_category_names"]),
+        arrays["edge_categories"], tuple(header["edge_category_names"]),
+        header["metadata"],
+        adjacency=(arrays["indptr"], arrays["indices"], arrays["adjacency_edges"]),
+        node_ids=header.get("node_ids"),
+        ley_line_ids=header.get("ley_line_ids")
+    )
+
+def infer_compression(path: str, compression: str = 'infer'):
+    """
+    Resolve a compression argument, looking at the file extension for 'infer'.
+
+    Returns:
+        str or None: A key of JSON_COMPRESSIONS, or None for plain text.
+
+    Raises:
+        ValueError: If the compression is unsupported.
+    """
+    if compression == 'infer':
+        return _COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression is not None and compression not in JSON_COMPRESSIONS:
+        raise ValueError(f"Unsupported compression '{compression}'. Supported compressions are {tuple(JSON_COMPRESSIONS)}.")
+    return compression
+
+def open_text(path: str, mode: str, compression: str = None):
+    """Open a UTF-8 text file, transparently (de)compressing with a stdlib codec."""
+    if compression is None:
+        return open(path, mode, encoding='utf-8')
+    return JSON_COMPRESSIONS[compression](path, mode + 't', encoding='utf-8')
+
+def export_bytes(data, export_format: str = 'json', indent: int = 2) -> bytes:
+    """
+    Serialise a network for download.
+
+    Args:
+        data: Legacy network dictionary or NetworkArrays.
+        export_format (str): One of EXPORT_FORMATS: 'json', 'json.gz' or 'binary'.
+        indent (int): JSON indent, or None for compact output.
+
+    Returns:
+        bytes: The encoded network.
+
+    Raises:
+        ValueError: If the export format is unsupported.
+    """
+    if export_format == 'binary':
+        buffer = io.BytesIO()
+        write_binary(data, buffer)
+        return buffer.getvalue()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'. Supported formats are {EXPORT_FORMATS}.")
+    return _encode_json(iter_json_chunks(data, indent), export_format)
+
+def export_batch_bytes(results: list, export_format: str = 'json', indent: int = 2) -> bytes:
+    """
+    Serialise batch results (as returned by batch_engine.run_batch) for download.
+
+    Args:
+        results (list): Batch result dictionaries; each 'data' entry is a network.
+        export_format (str): 'json' or 'json.gz'.
+        indent (int): JSON indent, or None for compact output.
+
+    Returns:
+        bytes: The encoded batch, readable with iter_batch_results.
+
+    Raises:
+        ValueError: If the export format is unsupported.
+    """
+    if export_format not in BATCH_EXPORT_FORMATS:
+        raise ValueError(f"Unsupported batch export format '{export_format}'. Supported formats are {BATCH_EXPORT_FORMATS}.")
+    return _encode_json(iter_batch_json_chunks(results, indent), export_format)
+
+def _encode_json(chunks, export_format: str) -> bytes:
+    # UTF-8 encode streamed JSON chunks, gzip-compressed for 'json.gz'
+    buffer = io.BytesIO()
+    if export_format == 'json.gz':
+        with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as stream:
+            for chunk in chunks:
+                stream.write(chunk.encode('utf-8'))
+    else:
+        for chunk in chunks:
+            buffer.write(chunk.encode('utf-8'))
+    return buffer.getvalue()
+
+def iter_json_chunks(data, indent: int = 4):
+    """
+    Serialise a network dictionary to JSON piece by piece.
+
+    Nodes and ley lines are encoded one record at a time, so the full document never
+    exists in memory. NetworkArrays are streamed through iter_nodes/iter_ley_lines
+    without building the legacy lists. With an indent the output is identical to
+    json.dump(data, file, indent=indent); with indent=None it is compact.
+
+    Args:
+        data: Legacy network dictionary or NetworkArrays.
+        indent (int): Spaces per nesting level, or None for compact output.
+
+    Yields:
+        str: Consecutive pieces of the JSON document.
+    """
+    streams = {}
+    if isinstance(data, NetworkArrays):
+        streams = {'nodes': data.iter_nodes(), 'ley_lines': data.iter_ley_lines()}
+    separators = (',', ': ') if indent is not None else (',', ':')
+    encoder = json.JSONEncoder(indent=indent, separators=separators)
+
+    if indent is None:
+        newline, pad, pad2 = '', '', ''
+    else:
+        newline, pad, pad2 = '\n', ' ' * indent, ' ' * (2 * indent)
+
+    def nested(text: str, prefix: str) -> str:
+        return text.replace('\n', '\n' + prefix) if prefix else text
+
+    keys = list(data.keys())
+    if not keys:
+        yield '{}'
+        return
+    yield '{' + newline
+    for k, key in enumerate(keys):
+        yield pad + encoder.encode(key) + separators[1]
+        if key in ('nodes', 'ley_lines'):
+            items = streams.get(key)
+            if items is None:
+                items = iter(data[key])
+            first = True
+            for item in items:
+                yield ('[' + newline if first else ',' + newline) + pad2 + nested(encoder.encode(item), pad2)
+                first = False
+            yield '[]' if first else newline + pad + ']'
+        else:
+            yield nested(encoder.encode(data[key]), pad)
+        yield (',' if k < len(keys) - 1 else '') + newline
+    yield '}'
+
+def iter_batch_json_chunks(results: list, indent: int = 4):
+    """
+    Serialise a list of batch results to JSON piece by piece.
+
+    Every 'data' network is streamed through iter_json_chunks; the other entries are
+    small and encoded whole. With an indent the output is identical to
+    json.dump(results, file, indent=indent); with indent=None it is compact.
+
+    Args:
+        results (list): Batch result dictionaries.
+        indent (int): Spaces per nesting level, or None for compact output.
+
+    Yields:
+        str: Consecutive pieces of the JSON document.
+    """
+    separators = (',', ': ') if indent is not None else (',', ':')
+    encoder = json.JSONEncoder(indent=indent, separators=separators)
+    if indent is None:
+        newline, pad, pad2 = '', '', ''
+    else:
+        newline, pad, pad2 = '\n', ' ' * indent, ' ' * (2 * indent)
+
+    def nested(text: str, prefix: str) -> str:
+        return text.replace('\n', '\n' + prefix) if prefix else text
+
+    if not results:
+        yield '[]'
+        return
+    yield '['
+    for r, result in enumerate(results):
+        yield (',' if r else '') + newline + pad
+        keys = list(result.keys())
+        if not keys:
+            yield '{}'
+            continue
+        yield '{' + newline
+        for k, key in enumerate(keys):
+            yield pad2 + encoder.encode(key) + separators[1]
+            if key == 'data':
+                for chunk in iter_json_chunks(result[key], indent):
+                    yield nested(chunk, pad2)
+            else:
+                yield nested(encoder.encode(result[key]), pad2)
+            yield (',' if k < len(keys) - 1 else '') + newline
+        yield pad + '}'
+    yield newline + ']'
+
+class JsonStreamReader:
+    """
+    Pull parser that walks the structure of a JSON text stream.
+
+    Containers are entered with iter_object/iter_array; everything else is decoded one
+    value at a time with json.JSONDecoder.raw_decode. Only the value being decoded and
+    one read block are buffered, so memory stays bounded by the largest leaf record
+    rather than by the file.
+    """
+
+    def __init__(self, file, read_size: int = JSON_READ_SIZE):
+        self.file = file
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> bool:
+        # Drop the consumed prefix and append the next block; False at end of input
+        if self.eof:
+            return False
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self._fill(self.read_size):
+                raise ValueError("Unexpected end of JSON input.")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' but found '{self.buffer[self.pos]}' in JSON input.")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        size = self.read_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: read a larger block and retry
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number cut off by the end of the buffer may continue in the next block
+            if (end == len(self.buffer) or self.buffer[end] not in _VALUE_TERMINATORS) and self._fill(size):
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Enter an array; the caller consumes each element (e.g. with value()) per iteration."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' but found '{char}' in JSON input.")
+
+    def iter_values(self):
+        """Yield the elements of an array, decoded one at a time."""
+        for _ in self.iter_array():
+            yield self.value()
+
+    def iter_object(self):
+        """Enter an object and yield its keys; the caller consumes each value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"Expected ',' or '}}' but found '{char}' in JSON input.")
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def read_network(reader: JsonStreamReader, radius: float = 6371, chunk_records: int = JSON_CHUNK_RECORDS) -> NetworkArrays:
+    """
+    Read one network object from a JsonStreamReader into NetworkArrays.
+
+    Nodes and ley lines are decoded chunk_records at a time and converted to arrays
+    straight away; keys other than nodes, ley_lines and metadata are skipped.
+
+    Args:
+        reader (JsonStreamReader): Reader positioned at the network object.
+        radius (float): Radius of the sphere in kilometers.
+        chunk_records (int): Records decoded per chunk.
+
+    Returns:
+        NetworkArrays: The network.
+    """
+    builder = NetworkArraysBuilder()
+    metadata = {}
+    for key in reader.iter_object():
+        if key == 'nodes':
+            for chunk in _chunks(reader.iter_values(), chunk_records):
+                builder.add_nodes(chunk)
+        elif key == 'ley_lines':
+            for chunk in _chunks(reader.iter_values(), chunk_records):
+                builder.add_ley_lines(chunk)
+        elif key == 'metadata':
+            metadata = reader.value()
+        else:
+            reader.value()
+    return builder.build(radius, metadata)
+
+def load_network_json(input_file: str, radius: float = 6371, compression: str = 'infer',
+                      chunk_records: int = JSON_CHUNK_RECORDS) -> NetworkArrays:
+    """
+    Load a network JSON file (e.g. ley_lines_<solid>.json) incrementally.
+
+    Args:
+        input_file (str): Path to the JSON file, optionally compressed.
+        radius (float): Radius of the sphere in kilometers (not stored in the JSON).
+        compression (str): 'gzip', 'bz2', 'lzma', None, or 'infer' from the extension.
+        chunk_records (int): Records decoded per chunk.
+
+    Returns:
+        NetworkArrays: The network.
+
+    Raises:
+        ValueError: If the file is not valid JSON.
+    """
+    with open_text(input_file, "r", infer_compression(input_file, compression)) as file:
+        return read_network(JsonStreamReader(file), radius, chunk_records)
+
+def iter_batch_results(input_file: str, compression: str = 'infer', chunk_records: int = JSON_CHUNK_RECORDS):
+    """
+    Iterate over a batch export (batch_configurations.json) one configuration at a time.
+
+    Only one network is held in memory at once; its 'data' entry is loaded as
+    NetworkArrays using the radius from the configuration.
+
+    Args:
+        input_file (str): Path to the batch JSON file, optionally compressed.
+        compression (str): 'gzip', 'bz2', 'lzma', None, or 'infer' from the extension.
+        chunk_records (int): Records decoded per chunk.
+
+    Yields:
+        dict: Batch result with 'configuration', 'data' (NetworkArrays), 'validation'
+              and 'statistics' as present in the file.
+    """
+    with open_text(input_file, "r", infer_compression(input_file, compression)) as file:
+        reader = JsonStreamReader(file)
+        for _ in reader.iter_array():
+            result = {}
+            for key in reader.iter_object():
+                if key == 'data':
+                    # Batch files list 'configuration' first, which carries the radius
+                    radius = result.get('configuration', {}).get('radius', 6371)
+                    result['data'] = read_network(reader, radius, chunk_records)
+                else:
+                    result[key] = reader.value()
+            yield result
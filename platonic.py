@@ -0,0 +1,96 @@
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+# Read-only geometry of a Platonic solid on the unit sphere. Latitudes and longitudes
+# are in degrees and do not depend on the sphere radius; edges are sorted (i, j)
+# pairs; faces are tuples of vertex indices ordered around each face.
+PlatonicTable = namedtuple('PlatonicTable', ['vertices', 'latitudes', 'longitudes', 'edges', 'faces'])
+
+PLATONIC_SOLIDS = ('tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron')
+
+def _raw_vertices(solid_type: str) -> np.ndarray:
+    """Unnormalised vertex coordinates, in the order generate_platonic_solid has always used."""
+    phi = (1 + np.sqrt(5)) / 2  # Golden ratio
+    if solid_type == 'tetrahedron':
+        return np.array([[1, 1, 1], [-1, -1, 1], [-1, 1, -1], [1, -1, -1]], dtype=np.float64)
+    if solid_type == 'cube':
+        return np.array([[x, y, z] for x in (1, -1) for y in (1, -1) for z in (1, -1)], dtype=np.float64)
+    if solid_type == 'octahedron':
+        return np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]], dtype=np.float64)
+    points = []
+    for i in [-1, 1]:
+        for j in [-1, 1]:
+            if solid_type == 'dodecahedron':
+                points.extend([[0, i / phi, j * phi], [i / phi, j * phi, 0], [i * phi, 0, j / phi]])
+            else:
+                points.extend([[0, i, j * phi], [i, j * phi, 0], [i * phi, 0, j]])
+    return np.array(points, dtype=np.float64)
+
+def _hull_faces(vertices: np.ndarray) -> tuple:
+    """
+    Faces of the convex hull of a small point set on the sphere.
+
+    Every plane through three vertices that has all other vertices on one side is a
+    face; the vertices on that plane are ordered by angle around the face centre.
+    """
+    faces = {}
+    for a, b, c in combinations(range(len(vertices)), 3):
+        normal = np.cross(vertices[b] - vertices[a], vertices[c] - vertices[a])
+        if np.linalg.norm(normal) < 1e-12:
+            continue
+        side = (vertices - vertices[a]) @ normal
+        if np.all(side <= 1e-9) or np.all(side >= -1e-9):
+            members = tuple(np.nonzero(np.abs(side) <= 1e-9)[0].tolist())
+            faces.setdefault(members, normal)
+
+    ordered = []
+    for members in sorted(faces):
+        points = vertices[list(members)]
+        centre = points.mean(axis=0)
+        u = points[0] - centre
+        v = np.cross(centre, u)
+        angles = np.arctan2((points - centre) @ v, (points - centre) @ u)
+        ordered.append(tuple(members[k] for k in np.argsort(angles)))
+    return tuple(ordered)
+
+@lru_cache(maxsize=None)
+def get_platonic_table(solid_type: str) -> PlatonicTable:
+    """
+    Unit-sphere vertex, edge and face tables of a Platonic solid, built once on first use.
+
+    All arrays are read-only so that callers can share them; scale ``vertices`` by a
+    radius to place the solid on a sphere.
+
+    Args:
+        solid_type (str): Type of Platonic solid.
+
+    Returns:
+        PlatonicTable: Precomputed geometry.
+
+    Raises:
+        ValueError: If an unsupported solid_type is provided.
+    """
+    if solid_type not in PLATONIC_SOLIDS:
+        raise ValueError(f"Unsupported solid_type '{solid_type}'. Supported types are 'tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron'.")
+
+    vertices = _raw_vertices(solid_type)
+    vertices /= np.linalg.norm(vertices, axis=1)[:, np.newaxis]
+
+    # One batched conversion replaces per-node asin/atan2 calls
+    latitudes = np.degrees(np.arcsin(np.clip(vertices[:, 2], -1.0, 1.0)))
+    longitudes = np.degrees(np.arctan2(vertices[:, 1], vertices[:, 0]))
+
+    faces = _hull_faces(vertices)
+    edge_set = set()
+    for face in faces:
+        for k in range(len(face)):
+            a, b = face[k], face[(k + 1) % len(face)]
+            edge_set.add((min(a, b), max(a, b)))
+    edges = np.array(sorted(edge_set), dtype=np.int64)
+
+    for array in (vertices, latitudes, longitudes, edges):
+        array.setflags(write=False)
+    return PlatonicTable(vertices, latitudes, longitudes, edges, faces)
@@ -0,0 +1,263 @@
+import math
+import numpy as np
+
+from distance_engine import unit_vectors, haversine_distances
+
+# Offsets of a cell and its 26 neighbours in the 3D grid
+_NEIGHBOR_OFFSETS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+    dtype=np.int64
+)
+
+# Smallest supported cell edge on the unit sphere, keeps cell keys within int64
+_MIN_CELL_SIZE = 1e-5
+
+# Number of query points expanded per chunk when generating candidate pairs
+_QUERY_CHUNK = 4096
+
+def distance_to_chord(distance: float, radius: float) -> float:
+    """
+    Convert a great-circle distance to the chord length between the points on the unit sphere.
+
+    Args:
+        distance (float): Great-circle distance in kilometers.
+        radius (float): Radius of the sphere in kilometers.
+
+    Returns:
+        float: Chord length on the unit sphere, between 0 and 2.
+    """
+    angle = min(max(distance / radius, 0.0), math.pi)
+    return 2 * math.sin(angle / 2)
+
+def grid_cells(xyz, cell_size: float) -> np.ndarray:
+    """
+    Integer cell coordinates of unit vectors in a cubic grid of edge cell_size.
+
+    Args:
+        xyz: Unit vector(s) with x, y, z in the last axis.
+        cell_size (float): Cell edge length as a unit-sphere chord.
+
+    Returns:
+        numpy.ndarray: int64 cell coordinates with the shape of xyz.
+    """
+    return np.floor((np.asarray(xyz) + 1.0) / cell_size).astype(np.int64)
+
+def neighbor_cells(cells) -> np.ndarray:
+    """
+    The 27 cells around (and including) each cell.
+
+    Args:
+        cells: Integer cell coordinate(s) with x, y, z in the last axis.
+
+    Returns:
+        numpy.ndarray: Array of shape cells.shape[:-1] + (27, 3).
+    """
+    return np.asarray(cells, dtype=np.int64)[..., np.newaxis, :] + _NEIGHBOR_OFFSETS
+
+def chord_to_distance(chord, radius: float):
+    """
+    Convert unit-sphere chord lengths back to great-circle distances.
+
+    Args:
+        chord: Chord length(s) on the unit sphere.
+        radius (float): Radius of the sphere in kilometers.
+
+    Returns:
+        Great-circle distance(s) in kilometers.
+    """
+    return radius * 2 * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+class SphereGrid:
+    """
+    Uniform 3D cell grid over node unit vectors for radius-limited queries on the sphere.
+
+    Points are bucketed into cubic cells of edge ``cell_size`` (in unit-sphere chord
+    units). Every pair of points closer than ``cell_size`` lies in the same or in
+    adjacent cells, so a radius query only has to inspect 27 cells per point.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_size: float):
+        """
+        Build the grid.
+
+        Args:
+            lat (numpy.ndarray): Latitudes in radians.
+            lon (numpy.ndarray): Longitudes in radians.
+            cell_size (float): Cell edge length as a unit-sphere chord.
+
+        Raises:
+            ValueError: If cell_size is not positive.
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be a positive number.")
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.xyz = unit_vectors(self.lat, self.lon)
+        self.cell_size = max(float(cell_size), _MIN_CELL_SIZE)
+        self.dim = int(math.floor(2.0 / self.cell_size)) + 1
+
+        self.cells = grid_cells(self.xyz, self.cell_size)
+        np.clip(self.cells, 0, self.dim - 1, out=self.cells)
+        keys = self._cell_keys(self.cells)
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            sorted_keys, return_index=True, return_counts=True
+        )
+
+    @classmethod
+    def for_distance(cls, lat: np.ndarray, lon: np.ndarray, radius: float, max_distance: float) -> 'SphereGrid':
+        """
+        Build a grid whose cells match a great-circle query distance.
+
+        Args:
+            lat (numpy.ndarray): Latitudes in radians.
+            lon (numpy.ndarray): Longitudes in radians.
+            radius (float): Radius of the sphere in kilometers.
+            max_distance (float): Query distance in kilometers.
+
+        Returns:
+            SphereGrid: Grid with cell_size equal to the chord of max_distance.
+        """
+        # Slight inflation guards pairs sitting exactly on the query distance
+        return cls(lat, lon, distance_to_chord(max_distance, radius) * (1 + 1e-9))
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _cell_keys(self, cells: np.ndarray) -> np.ndarray:
+        return (cells[..., 0] * self.dim + cells[..., 1]) * self.dim + cells[..., 2]
+
+    def cell_labels(self) -> np.ndarray:
+        """
+        Index of the occupied cell holding each point.
+
+        Returns:
+            numpy.ndarray: Labels in [0, number of occupied cells), ordered like cell_keys.
+        """
+        return np.searchsorted(self.cell_keys, self._cell_keys(self.cells))
+
+    def _neighbor_candidates(self, query: np.ndarray) -> tuple:
+        """
+        Expand query point indices to all points stored in their 27 neighbouring cells.
+
+        Returns:
+            tuple: (query_idx, candidate_idx) arrays of equal length.
+        """
+        around = neighbor_cells(self.cells[query])
+        inside = np.all((around >= 0) & (around < self.dim), axis=2)
+        keys = self._cell_keys(around)
+
+        slot = np.searchsorted(self.cell_keys, keys)
+        slot = np.minimum(slot, len(self.cell_keys) - 1)
+        found = inside & (self.cell_keys[slot] == keys)
+
+        owner = np.broadcast_to(query[:, np.newaxis], keys.shape)[found]
+        starts = self.cell_start[slot[found]]
+        counts = self.cell_count[slot[found]]
+
+        total = int(counts.sum())
+        query_idx = np.repeat(owner, counts)
+        # Position of each candidate within its cell run
+        run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate_idx = self.order[np.repeat(starts, counts) + run_offsets]
+        return query_idx, candidate_idx
+
+    def query_pairs(self, radius: float, min_distance: float, max_distance: float, stats: dict = None) -> tuple:
+        """
+        Find all pairs (i, j), i < j, whose great-circle distance lies in [min_distance, max_distance].
+
+        Candidate pairs come from neighbouring cells only; their exact distance is then
+        evaluated with the same haversine formula as the all-pairs engine, so the result
+        matches distance_engine.find_pairs_in_range whenever max_distance fits the grid.
+
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+            min_distance (float): Minimum distance (inclusive) in kilometers.
+            max_distance (float): Maximum distance (inclusive) in kilometers.
+            stats (dict): Optional dictionary; 'candidates' is set to the number of pairs
+                          whose distance was evaluated.
+
+        Returns:
+            tuple: (rows, cols, distances) arrays in row-major pair order.
+
+        Raises:
+            ValueError: If max_distance exceeds the reach of the grid cells.
+        """
+        if distance_to_chord(max_distance, radius) > self.cell_size * (1 + 1e-9):
+            raise ValueError("max_distance exceeds the grid cell size; rebuild the grid with SphereGrid.for_distance.")
+
+        found_rows, found_cols, found_dist = [], [], []
+        candidates = 0
+        for start in range(0, len(self), _QUERY_CHUNK):
+            query = np.arange(start, min(start + _QUERY_CHUNK, len(self)))
+            rows, cols = self._neighbor_candidates(query)
+            upper = cols > rows
+            rows, cols = rows[upper], cols[upper]
+            candidates += len(rows)
+            distances = haversine_distances(self.lat[rows], self.lon[rows], self.lat[cols], self.lon[cols], radius)
+            keep = (distances >= min_distance) & (distances <= max_distance)
+            found_rows.append(rows[keep])
+            found_cols.append(cols[keep])
+            found_dist.append(distances[keep])
+
+        if stats is not None:
+            stats['candidates'] = candidates
+        if not found_rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty.copy(), np.empty(0, dtype=np.float64)
+        rows = np.concatenate(found_rows)
+        cols = np.concatenate(found_cols)
+        distances = np.concatenate(found_dist)
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order], distances[order]
+
+    def nearest_neighbor_distances(self, radius: float) -> np.ndarray:
+        """
+        Great-circle distance from every point to its nearest other point.
+
+        Points whose nearest neighbour lies outside the adjacent cells fall back to
+        a brute-force scan, so the result is exact for any cell size.
+
+        Args:
+            radius (float): Radius of the sphere in kilometers.
+
+        Returns:
+            numpy.ndarray: Nearest-neighbour distances in kilometers (inf for a single point).
+        """
+        num_points = len(self)
+        best = np.full(num_points, np.inf)
+        for start in range(0, num_points, _QUERY_CHUNK):
+            query = np.arange(start, min(start + _QUERY_CHUNK, num_points))
+            rows, cols = self._neighbor_candidates(query)
+            other = rows != cols
+            rows, cols = rows[other], cols[other]
+            chords = np.linalg.norm(self.xyz[rows] - self.xyz[cols], axis=1)
+            np.minimum.at(best, rows, chords)
+
+        # Neighbours further than one cell away may hide in non-adjacent cells
+        unresolved = np.nonzero(best > self.cell_size)[0]
+        for idx in unresolved:
+            chords = np.linalg.norm(self.xyz - self.xyz[idx], axis=1)
+            chords[idx] = np.inf
+            best[idx] = chords.min() if num_points > 1 else np.inf
+
+        result = np.full(num_points, np.inf)
+        finite = np.isfinite(best)
+        result[finite] = chord_to_distance(best[finite], radius)
+        return result
+
+    @classmethod
+    def for_nearest_neighbors(cls, lat: np.ndarray, lon: np.ndarray) -> 'SphereGrid':
+        """
+        Build a grid sized to the mean point spacing, suited for nearest-neighbour queries.
+
+        Args:
+            lat (numpy.ndarray): Latitudes in radians.
+            lon (numpy.ndarray): Longitudes in radians.
+
+        Returns:
+            SphereGrid: Grid with roughly a handful of points per occupied cell.
+        """
+        spacing = math.sqrt(4 * math.pi / max(len(lat), 1))
+        return cls(lat, lon, min(2.0, 2 * spacing))
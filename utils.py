@@ -1,115 +1,426 @@
 import plotly.graph_objects as go
+import hashlib
 import json
+import math
+import threading
 import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
 
-def create_globe_visualization(nodes, ley_lines, radius, reference_point=None):
+from spatial_index import SphereGrid
+
+# Names of the traces that depend on the reference point
+REFERENCE_TRACES = ('Equator', 'Meridian', 'Reference Point')
+
+@lru_cache(maxsize=16)
+def sphere_mesh(radius, resolution=100):
+    """
+    Sphere surface grid, built once per (radius, resolution).
+
+    Args:
+        radius: Sphere radius in kilometers
+        resolution: Number of grid points along longitude and latitude
+
+    Returns:
+        tuple: Read-only (x, y, z) arrays of shape (resolution, resolution)
+    """
+    phi = np.linspace(0, 2*np.pi, resolution)
+    theta = np.linspace(-np.pi/2, np.pi/2, resolution)
+    phi, theta = np.meshgrid(phi, theta)
+    
+    x = radius * np.cos(theta) * np.cos(phi)
+    y = radius * np.cos(theta) * np.sin(phi)
+    z = radius * np.sin(theta)
+    for array in (x, y, z):
+        array.setflags(write=False)
+    return x, y, z
+
+@lru_cache(maxsize=16)
+def equator_line(radius, resolution=100):
+    """
+    Equator polyline, built once per (radius, resolution).
+
+    Returns:
+        tuple: Read-only (x, y, z) arrays of length resolution
+    """
+    eq_phi = np.linspace(0, 2*np.pi, resolution)
+    eq_x = radius * np.cos(eq_phi)
+    eq_y = radius * np.sin(eq_phi)
+    eq_z = np.zeros_like(eq_phi)
+    for array in (eq_x, eq_y, eq_z):
+        array.setflags(write=False)
+    return eq_x, eq_y, eq_z
+
+def _reference_traces(reference_point, radius, resolution=100):
+    """
+    Build the equator, meridian and marker traces for a reference point.
+
+    Returns:
+        list: Scatter3d traces named as in REFERENCE_TRACES (empty without a reference point)
+    """
+    if not reference_point:
+        return []
+    lat = np.radians(reference_point['latitude'])
+    lon = np.radians(reference_point['longitude'])
+    
+    eq_x, eq_y, eq_z = equator_line(radius, resolution)
+    equator = go.Scatter3d(x=eq_x, y=eq_y, z=eq_z, mode='lines',
+                           line=dict(color='gray', width=1),
+                           name='Equator')
+    
+    # Meridian through the point
+    mer_theta = np.linspace(-np.pi/2, np.pi/2, resolution)
+    mer_x = radius * np.cos(mer_theta) * np.cos(lon)
+    mer_y = radius * np.cos(mer_theta) * np.sin(lon)
+    mer_z = radius * np.sin(mer_theta)
+    meridian = go.Scatter3d(x=mer_x, y=mer_y, z=mer_z, mode='lines',
+                            line=dict(color='gray', width=1),
+                            name='Meridian')
+    
+    x_ref = radius * np.cos(lat) * np.cos(lon)
+    y_ref = radius * np.cos(lat) * np.sin(lon)
+    z_ref = radius * np.sin(lat)
+    marker = go.Scatter3d(x=[x_ref], y=[y_ref], z=[z_ref],
+                          mode='markers',
+                          marker=dict(size=8, color='yellow'),
+                          name='Reference Point')
+    return [equator, meridian, marker]
+
+def update_reference_point(fig, reference_point, radius, resolution=100):
+    """
+    Move, add or remove the reference point on a figure from create_globe_visualization.
+
+    Only the meridian and marker traces are patched when the figure already shows a
+    reference point; the sphere, nodes and ley lines are left untouched.
+    
+    Args:
+        fig: Figure returned by create_globe_visualization
+        reference_point: Dictionary with latitude and longitude, or None to remove it
+        radius: Sphere radius in kilometers
+        resolution: Resolution used when the figure was created
+
+    Returns:
+        The same figure, updated in place
+    """
+    traces = _reference_traces(reference_point, radius, resolution)
+    existing = {trace.name: trace for trace in fig.data if trace.name in REFERENCE_TRACES}
+    if traces and len(existing) == len(REFERENCE_TRACES):
+        for trace in traces[1:]:
+            existing[trace.name].update(x=trace.x, y=trace.y, z=trace.z)
+        return fig
+
+    fig.data = tuple(trace for trace in fig.data if trace.name not in REFERENCE_TRACES)
+    if traces:
+        fig.add_traces(traces)
+        # Keep the reference traces directly after the sphere surface
+        fig.data = fig.data[:1] + fig.data[-len(traces):] + fig.data[1:-len(traces)]
+    return fig
+
+def _node_positions(nodes, radius):
+    """
+    Map node ids to row indices and compute Cartesian node positions in one pass.
+
+    Args:
+        nodes: List of node dictionaries
+        radius: Sphere radius in kilometers
+
+    Returns:
+        tuple: (id -> index dictionary, (n, 3) array of xyz positions)
+    """
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    lat = np.radians(np.fromiter((node['coordinates']['latitude'] for node in nodes), dtype=np.float64, count=len(nodes)))
+    lon = np.radians(np.fromiter((node['coordinates']['longitude'] for node in nodes), dtype=np.float64, count=len(nodes)))
+    positions = radius * np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+    return index, positions
+
+def _line_segments(positions, endpoints):
+    """
+    Flatten line segments into x, y, z lists separated by None so they fit in one trace.
+
+    Args:
+        positions: (n, 3) array of node positions
+        endpoints: (m, 2) array of node indices
+
+    Returns:
+        tuple: (x, y, z) lists of length 3 * m
+    """
+    coords = np.full((len(endpoints), 3, 3), np.nan)
+    coords[:, 0] = positions[endpoints[:, 0]]
+    coords[:, 1] = positions[endpoints[:, 1]]
+    flat = coords.reshape(-1, 3).astype(object)
+    flat[np.isnan(coords.reshape(-1, 3))] = None
+    return flat[:, 0].tolist(), flat[:, 1].tolist(), flat[:, 2].tolist()
+
+def arc_vertex_counts(positions, endpoints, radius, arc_points):
+    """
+    Number of vertices great_circle_arcs uses for each line, without building the arcs.
+
+    Args:
+        positions: (n, 3) array of node positions
+        endpoints: (m, 2) array of node indices
+        radius: Sphere radius in kilometers
+        arc_points: Number of vertices of a half-circumference arc (at least 2)
+
+    Returns:
+        tuple: ((m,) array of vertices per arc, (m,) array of arc angles in radians)
+    """
+    start = positions[endpoints[:, 0]] / radius
+    end = positions[endpoints[:, 1]] / radius
+    cos_angle = np.clip(np.einsum('ij,ij->i', start, end), -1.0, 1.0)
+    angle = np.arccos(cos_angle)
+    counts = np.maximum(2, np.ceil(angle / np.pi * (arc_points - 1)).astype(np.int64) + 1)
+    return counts, angle
+
+def _line_costs(positions, endpoints, radius, arc_points):
+    """
+    Line segments drawn per ley line: one per chord, or the segments of its arc.
+
+    Returns:
+        np.ndarray: (m,) array of segment counts
+    """
+    if not arc_points:
+        return np.ones(len(endpoints), dtype=np.int64)
+    return arc_vertex_counts(positions, endpoints, radius, arc_points)[0] - 1
+
+def great_circle_arcs(positions, endpoints, radius, arc_points):
+    """
+    Densify line segments into great-circle arcs with spherical linear interpolation.
+
+    ``arc_points`` vertices are used for an arc spanning half the globe; shorter arcs
+    get proportionally fewer (at least two), so short lines stay cheap. All arcs are
+    interpolated in one batched pass. Antipodal endpoints have no unique great
+    circle and are drawn as straight chords.
+
+    Args:
+        positions: (n, 3) array of node positions
+        endpoints: (m, 2) array of node indices
+        radius: Sphere radius in kilometers
+        arc_points: Number of vertices of a half-circumference arc (at least 2)
+
+    Returns:
+        tuple: ((p, 3) array of arc vertices, (m,) array of vertices per arc)
+    """
+    start = positions[endpoints[:, 0]] / radius
+    end = positions[endpoints[:, 1]] / radius
+    counts, angle = arc_vertex_counts(positions, endpoints, radius, arc_points)
+
+    arc = np.repeat(np.arange(len(endpoints)), counts)
+    step = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = (step / (counts[arc] - 1))[:, np.newaxis]
+    omega = angle[arc][:, np.newaxis]
+    sin_omega = np.sin(omega)
+    curved = sin_omega > 1e-9
+    safe_sin = np.where(curved, sin_omega, 1.0)
+    weight_start = np.where(curved, np.sin((1 - t) * omega) / safe_sin, 1 - t)
+    weight_end = np.where(curved, np.sin(t * omega) / safe_sin, t)
+    points = radius * (weight_start * start[arc] + weight_end * end[arc])
+    return points, counts
+
+# Flattened arc traces keyed by (network digest, radius, arc_points), most recent last
+_ARC_CACHE = OrderedDict()
+_ARC_CACHE_SIZE = 8
+_arc_cache_lock = threading.Lock()
+
+def _cached_arc_segments(positions, endpoints, radius, arc_points):
+    """
+    Great-circle arcs flattened for one trace, cached per (network, arc_points).
+
+    Returns:
+        tuple: (x, y, z) lists with None between arcs
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(positions, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(endpoints, dtype=np.int64).tobytes())
+    key = (digest.hexdigest(), float(radius), int(arc_points))
+    with _arc_cache_lock:
+        if key in _ARC_CACHE:
+            _ARC_CACHE.move_to_end(key)
+            return _ARC_CACHE[key]
+
+    points, counts = great_circle_arcs(positions, endpoints, radius, arc_points)
+    # One NaN row after every arc becomes the None separator
+    slots = np.arange(len(points)) + np.repeat(np.arange(len(counts)), counts)
+    coords = np.full((len(points) + len(counts), 3), np.nan)
+    coords[slots] = points
+    flat = coords.astype(object)
+    flat[np.isnan(coords)] = None
+    segments = (flat[:, 0].tolist(), flat[:, 1].tolist(), flat[:, 2].tolist())
+
+    with _arc_cache_lock:
+        _ARC_CACHE[key] = segments
+        while len(_ARC_CACHE) > _ARC_CACHE_SIZE:
+            _ARC_CACHE.popitem(last=False)
+    return segments
+
+def _aggregate_network(positions, endpoints, primary, radius, max_primitives, arc_points=None):
+    """
+    Level-of-detail reduction: merge nodes into spherical grid cells and bundle ley lines between cells.
+
+    The cell size grows until the occupied cells fit the node share of the budget; if
+    the coarsest grid still has too many cells, only the most populated are drawn. Lines
+    between two cells collapse into one bundle (primary if any member is primary) and
+    lines inside a cell disappear. When bundles still exceed the budget, the bundles
+    carrying the most ley lines are kept. With arc_points, every bundle costs the
+    segments of its great-circle arc rather than a single segment.
+
+    Args:
+        positions: (n, 3) array of node positions
+        endpoints: (m, 2) array of node indices
+        primary: (m,) boolean array, True for primary ley lines
+        radius: Sphere radius in kilometers
+        max_primitives: Maximum number of markers plus line segments to draw (at least 1)
+        arc_points: Optional vertices per half-globe arc (None draws chords)
+
+    Returns:
+        dict: 'positions', 'sizes' (nodes per cell), 'endpoints', 'primary',
+              'counts' (ley lines per bundle) and 'segments' (line segments per
+              bundle) of the drawn primitives
+    """
+    unit = positions / radius
+    lat = np.arcsin(np.clip(unit[:, 2], -1.0, 1.0))
+    lon = np.arctan2(unit[:, 1], unit[:, 0])
+
+    # Give lines at most half of the budget, nodes the rest
+    line_cost = int(_line_costs(positions, endpoints, radius, arc_points).sum())
+    node_budget = max(1, max_primitives - min(line_cost, max_primitives // 2))
+    cell_size = math.sqrt(4 * math.pi / node_budget)
+    grid = SphereGrid(lat, lon, cell_size)
+    while len(grid.cell_keys) > node_budget and grid.cell_size < 2.0:
+        cell_size *= 1.25
+        grid = SphereGrid(lat, lon, cell_size)
+
+    labels = grid.cell_labels()
+    sizes = np.bincount(labels, minlength=len(grid.cell_keys))
+    if len(sizes) > node_budget:
+        # Coarsening stops at a minimum cell size; keep the most populated cells
+        kept = np.sort(np.argsort(-sizes, kind='stable')[:node_budget])
+        remap = np.full(len(sizes), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        labels = remap[labels]
+        sizes = sizes[kept]
+    num_cells = len(sizes)
+    drawn = labels >= 0
+    centroids = np.zeros((num_cells, 3))
+    np.add.at(centroids, labels[drawn], unit[drawn])
+    centroids *= radius / np.linalg.norm(centroids, axis=1)[:, np.newaxis]
+
+    a = labels[endpoints[:, 0]]
+    b = labels[endpoints[:, 1]]
+    between = (a != b) & (a >= 0) & (b >= 0)
+    keys, inverse, counts = np.unique(np.minimum(a, b)[between] * num_cells + np.maximum(a, b)[between],
+                                      return_inverse=True, return_counts=True)
+    bundle_primary = np.zeros(len(keys), dtype=bool)
+    np.logical_or.at(bundle_primary, inverse, primary[between])
+
+    bundles = np.column_stack((keys // num_cells, keys % num_cells))
+    segments = _line_costs(centroids, bundles, radius, arc_points)
+    edge_budget = max(0, max_primitives - num_cells)
+    selected = np.arange(len(keys))
+    if segments.sum() > edge_budget:
+        # Keep the heaviest bundles while their segments fit the remaining budget
+        order = np.argsort(-counts, kind='stable')
+        fits = np.searchsorted(np.cumsum(segments[order]), edge_budget, side='right')
+        selected = np.sort(order[:fits])
+    return {
+        "positions": centroids,
+        "sizes": sizes,
+        "endpoints": bundles[selected],
+        "primary": bundle_primary[selected],
+        "counts": counts[selected],
+        "segments": segments[selected]
+    }
+
+def create_globe_visualization(nodes, ley_lines, radius, reference_point=None, max_primitives=None,
+                               resolution=100, arc_points=None):
     """
     Create a 3D globe visualization using Plotly.
     
+    When the network needs more node markers plus line segments than max_primitives,
+    nodes are aggregated into spherical cells and ley lines bundled between cells. A
+    chord is one segment; with arc_points a ley line costs every segment of its arc.
+    The figure's layout.meta['lod'] reports the level of detail and the primitives drawn.
+    
     Args:
         nodes: List of node dictionaries
         ley_lines: List of ley line dictionaries
         radius: Sphere radius in kilometers
         reference_point: Optional dictionary with latitude and longitude for reference point
+        max_primitives: Optional budget of node markers plus line segments, arc segments
+                        included (None draws everything, otherwise at least 1)
+        resolution: Number of grid points per axis of the sphere mesh and reference lines
+        arc_points: Optional vertices per half-globe arc; draws ley lines as great-circle
+                    arcs instead of straight chords (None keeps chords)
+
+    Raises:
+        ValueError: If max_primitives is below 1.
     """
+    if max_primitives is not None and max_primitives < 1:
+        raise ValueError("max_primitives must be at least 1.")
+
     fig = go.Figure()
 
     # Add the sphere surface
-    phi = np.linspace(0, 2*np.pi, 100)
-    theta = np.linspace(-np.pi/2, np.pi/2, 100)
-    phi, theta = np.meshgrid(phi, theta)
-    
-    x = radius * np.cos(theta) * np.cos(phi)
-    y = radius * np.cos(theta) * np.sin(phi)
-    z = radius * np.sin(theta)
-    
+    x, y, z = sphere_mesh(radius, resolution)
     fig.add_surface(x=x, y=y, z=z, opacity=0.3, 
                    colorscale='Blues', showscale=False)
     
     # Add reference lines if a point is provided
-    if reference_point:
-        lat = np.radians(reference_point['latitude'])
-        lon = np.radians(reference_point['longitude'])
-        
-        # Add equator
-        eq_phi = np.linspace(0, 2*np.pi, 100)
-        eq_x = radius * np.cos(eq_phi)
-        eq_y = radius * np.sin(eq_phi)
-        eq_z = np.zeros_like(eq_phi)
-        fig.add_scatter3d(x=eq_x, y=eq_y, z=eq_z, mode='lines',
-                         line=dict(color='gray', width=1),
-                         name='Equator')
-        
-        # Add meridian through the point
-        mer_theta = np.linspace(-np.pi/2, np.pi/2, 100)
-        mer_x = radius * np.cos(mer_theta) * np.cos(lon)
-        mer_y = radius * np.cos(mer_theta) * np.sin(lon)
-        mer_z = radius * np.sin(mer_theta)
-        fig.add_scatter3d(x=mer_x, y=mer_y, z=mer_z, mode='lines',
-                         line=dict(color='gray', width=1),
-                         name='Meridian')
-        
-        # Add reference point
-        x_ref = radius * np.cos(lat) * np.cos(lon)
-        y_ref = radius * np.cos(lat) * np.sin(lon)
-        z_ref = radius * np.sin(lat)
-        fig.add_scatter3d(x=[x_ref], y=[y_ref], z=[z_ref],
-                         mode='markers',
-                         marker=dict(size=8, color='yellow'),
-                         name='Reference Point')
+    fig.add_traces(_reference_traces(reference_point, radius, resolution))
 
     # Add nodes
-    node_x = []
-    node_y = []
-    node_z = []
-    node_text = []
-    
-    for node in nodes:
-        lat = np.radians(node['coordinates']['latitude'])
-        lon = np.radians(node['coordinates']['longitude'])
-        
-        x_pos = radius * np.cos(lat) * np.cos(lon)
-        y_pos = radius * np.cos(lat) * np.sin(lon)
-        z_pos = radius * np.sin(lat)
-        
-        node_x.append(x_pos)
-        node_y.append(y_pos)
-        node_z.append(z_pos)
-        node_text.append(f"Node: {node['id']}<br>Lat: {node['coordinates']['latitude']:.2f}°<br>Lon: {node['coordinates']['longitude']:.2f}°")
-
-    fig.add_scatter3d(x=node_x, y=node_y, z=node_z,
+    index, positions = _node_positions(nodes, radius)
+    endpoints = np.array([(index[line['nodes'][0]], index[line['nodes'][1]]) for line in ley_lines],
+                         dtype=np.int64).reshape(-1, 2)
+    primary = np.array([line['category'] == 'primary' for line in ley_lines], dtype=bool)
+    total = len(nodes) + int(_line_costs(positions, endpoints, radius, arc_points).sum())
+
+    if max_primitives is not None and total > max_primitives:
+        lod = _aggregate_network(positions, endpoints, primary, radius, max_primitives, arc_points)
+        positions, endpoints, primary = lod['positions'], lod['endpoints'], lod['primary']
+        unit = positions / radius
+        drawn = len(positions) + int(lod['segments'].sum())
+        node_text = [f"Cluster of {size} nodes<br>Lat: {np.degrees(np.arcsin(z)):.2f}°<br>Lon: {np.degrees(np.arctan2(y, x)):.2f}°"
+                     for size, (x, y, z) in zip(lod['sizes'].tolist(), unit.tolist())]
+        lod_report = {
+            "level": "aggregated",
+            "drawn_nodes": len(positions),
+            "drawn_ley_lines": len(endpoints),
+            "drawn_primitives": drawn,
+            "drawn_fraction": drawn / total,
+            "ley_lines_represented": int(lod['counts'].sum()) / max(len(ley_lines), 1)
+        }
+    else:
+        node_text = [f"Node: {node['id']}<br>Lat: {node['coordinates']['latitude']:.2f}°<br>Lon: {node['coordinates']['longitude']:.2f}°"
+                     for node in nodes]
+        lod_report = {
+            "level": "full",
+            "drawn_nodes": len(nodes),
+            "drawn_ley_lines": len(ley_lines),
+            "drawn_primitives": total,
+            "drawn_fraction": 1.0,
+            "ley_lines_represented": 1.0
+        }
+
+    fig.add_scatter3d(x=positions[:, 0], y=positions[:, 1], z=positions[:, 2],
                      mode='markers',
                      marker=dict(size=8, color='red'),
                      text=node_text,
                      hoverinfo='text',
                      name='Nodes')
 
-    # Add ley lines
-    for line in ley_lines:
-        node1_id = line['nodes'][0]
-        node2_id = line['nodes'][1]
-        
-        node1 = next(node for node in nodes if node['id'] == node1_id)
-        node2 = next(node for node in nodes if node['id'] == node2_id)
-        
-        lat1 = np.radians(node1['coordinates']['latitude'])
-        lon1 = np.radians(node1['coordinates']['longitude'])
-        lat2 = np.radians(node2['coordinates']['latitude'])
-        lon2 = np.radians(node2['coordinates']['longitude'])
-        
-        x = [radius * np.cos(lat1) * np.cos(lon1),
-             radius * np.cos(lat2) * np.cos(lon2)]
-        y = [radius * np.cos(lat1) * np.sin(lon1),
-             radius * np.cos(lat2) * np.sin(lon2)]
-        z = [radius * np.sin(lat1),
-             radius * np.sin(lat2)]
-        
-        line_color = 'yellow' if line['category'] == 'primary' else 'cyan'
-        
+    # Add ley lines, one trace per category regardless of network size
+    for category, selected, line_color in (('primary', primary, 'yellow'), ('secondary', ~primary, 'cyan')):
+        if not selected.any():
+            continue
+        if arc_points:
+            x, y, z = _cached_arc_segments(positions, endpoints[selected], radius, arc_points)
+        else:
+            x, y, z = _line_segments(positions, endpoints[selected])
         fig.add_scatter3d(x=x, y=y, z=z,
                          mode='lines',
                          line=dict(color=line_color, width=2),
                          hoverinfo='none',
+                         name=f'{category.capitalize()} Ley Lines',
                          showlegend=False)
 
     fig.update_layout(
@@ -125,6 +436,7 @@ def create_globe_visualization(nodes, ley_lines, radius, reference_point=None):
             zaxis_title='Z'
         ),
         margin=dict(l=0, r=0, t=0, b=0),
+        meta={"lod": lod_report},
         showlegend=True,
         legend=dict(
             yanchor="top",